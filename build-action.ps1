@@ -11,6 +11,8 @@ python -m PyInstaller -n "MDCx_$currentDate" -F `
 --hidden-import socks `
 --hidden-import urllib3 `
 --hidden-import _cffi_backend `
---collect-all curl_cffi
+--collect-submodules watchdog `
+--collect-all curl_cffi `
+--collect-submodules models.crawlers
 
 Write-Output 'Done'
\ No newline at end of file
@@ -9,6 +9,8 @@ uv run python -m PyInstaller -n MDCx -F --noupx `
 --hidden-import socks `
 --hidden-import urllib3 `
 --hidden-import _cffi_backend `
---collect-all curl_cffi
+--collect-submodules watchdog `
+--collect-all curl_cffi `
+--collect-submodules models.crawlers
 
 Write-Output 'Done'
\ No newline at end of file
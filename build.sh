@@ -12,7 +12,9 @@ pyi-makespec -n "$FileName" -F \
 --hidden-import socks \
 --hidden-import urllib3 \
 --hidden-import _cffi_backend \
---collect-all curl_cffi
+--collect-submodules watchdog \
+--collect-all curl_cffi \
+--collect-submodules models.crawlers
 
 rm -rf dist
 
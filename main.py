@@ -1,15 +1,11 @@
 #!/usr/bin/env python3
+import multiprocessing
 import os
 import platform
 import sys
 
 import urllib3  # yapf: disable # NOQA: E402
 from PIL import ImageFile
-from PyQt5.QtCore import QCoreApplication, Qt
-from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QApplication
-
-from controllers.main_window.main_window import MyMAinWindow
 
 # import faulthandler
 # faulthandler.enable()
@@ -20,6 +16,15 @@ if __name__ == "__main__":
     """
     主函数
     """
+    multiprocessing.freeze_support()  # 打包后图片进程池的子进程从此处启动
+
+    # 图片进程池的子进程会以 __mp_main__ 重新导入本文件, Qt 及界面相关模块在此导入, 子进程不会加载
+    from PyQt5.QtCore import QCoreApplication, Qt
+    from PyQt5.QtGui import QIcon
+    from PyQt5.QtWidgets import QApplication
+
+    from controllers.main_window.main_window import MyMAinWindow
+
     if platform.system() != "Windows":
         import faulthandler
 
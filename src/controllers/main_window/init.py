@@ -99,6 +99,16 @@ def Init_Ui(self):
     self.Ui.textBrowser_log_main_3.hide()  # 失败列表隐藏
     self.Ui.pushButton_scraper_failed_list.hide()
     self.Ui.pushButton_save_failed_list.hide()
+    # javdb 延时及线程间隔已由配置文件中的 rate_limit(按域名限速)代替, 滑块仅保留显示, 不可修改
+    for widget in [
+        self.Ui.horizontalSlider_javdb_time,
+        self.Ui.lcdNumber_javdb_time,
+        self.Ui.horizontalSlider_thread_time,
+        self.Ui.lcdNumber_thread_time,
+    ]:
+        widget.setEnabled(False)
+        widget.setToolTip(" 已停用，请在配置文件的 rate_limit 中设置按域名限速 ")
+    self.Ui.label_26.setText("javdb 延时及线程间隔已停用，改为配置文件中的 rate_limit 按域名限速（默认 javdb:1:1，即每秒 1 次）。")
     self.Ui.comboBox_custom_website.addItems(config.SUPPORTED_WEBSITES)
     # self.Ui.textBrowser_log_main.document().setMaximumBlockCount(100000)     # 限制日志页最大行数rowCount
     # self.Ui.textBrowser_log_main_2.document().setMaximumBlockCount(30000)     # 限制日志页最大行数rowCount
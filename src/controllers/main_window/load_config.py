@@ -1089,6 +1089,10 @@ def load_config(self):
             self.timer_scrape.start(timed_interval_convert)
         else:
             self.Ui.checkBox_timed_scrape.setChecked(False)
+        if config.watch_mode == "on":
+            self.media_watcher.start(get_movie_path_setting()[0])
+        else:
+            self.media_watcher.stop()
         self.Ui.checkBox_remain_task.setChecked("remain_task" in switch_on)
         self.Ui.checkBox_show_dialog_exit.setChecked("show_dialog_exit" in switch_on)
         self.Ui.checkBox_show_dialog_stop_scrape.setChecked("show_dialog_stop_scrape" in switch_on)
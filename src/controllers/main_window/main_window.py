@@ -54,6 +54,7 @@ from models.core.nfo import write_nfo
 from models.core.scraper import again_search, get_remain_list, start_new_scrape
 from models.core.subtitle import add_sub_for_all_video
 from models.core.utils import deal_url, get_movie_path_setting
+from models.core.watcher import MediaWatcher
 from models.core.video import add_del_extras, add_del_theme_videos
 from models.core.web import show_netstatus
 from models.entity.enums import FileMode
@@ -130,6 +131,7 @@ class MyMAinWindow(QMainWindow):
         self.timer_remain_task.timeout.connect(save_remain_list)
         self.timer_remain_task.start(1500)  # 设置间隔1.5秒
         self.atuo_scrape_count = 0  # 循环刮削次数
+        self.media_watcher = MediaWatcher(self.watch_scrape)  # 监控待刮削目录，仅刮削新增文件
         self.label_number_url = ""
         self.label_actor_url = ""
         # endregion
@@ -2578,6 +2580,16 @@ class MyMAinWindow(QMainWindow):
                 )
             start_new_scrape(FileMode.Default)
 
+    def watch_scrape(self, movie_list):
+        """
+        监控模式发现新文件时调用（在监控线程中）, 正在刮削时返回 False, 待下次检查时再刮削
+        """
+        if self.Ui.pushButton_start_cap.text() != "开始":
+            return False
+        signal.show_log_text(f"\n\n 👀 监控到 {len(movie_list)} 个新文件！即将开始刮削！")
+        start_new_scrape(FileMode.Default, movie_list)
+        return True
+
     def auto_start(self):
         if "auto_start" in config.switch_on:
             signal.show_log_text("\n\n 🍔 已启用「软件启动后自动刮削」！即将开始自动刮削！")
@@ -0,0 +1,4 @@
+"""
+MDCx 命令行入口, 不加载图形界面
+    python -m mdcx scrape <path>
+"""
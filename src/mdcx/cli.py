@@ -0,0 +1,175 @@
+"""
+命令行模式, 使用不依赖 Qt 的信号实现驱动 models.core.scraper.scrape, 适用于 NAS、容器、定时任务等无界面环境
+与图形界面共用配置文件
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(prog="python -m mdcx", description="MDCx 命令行模式")
+    # 各子命令共用的参数
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-c", "--config", default="", help="配置文件路径, 默认使用 MDCx.config 中记录的配置文件")
+    common.add_argument("-t", "--thread", type=int, default=0, help="线程数量, 默认使用配置中的线程数量")
+    common.add_argument("--json", action="store_true", help="以 JSON Lines 格式输出日志及结果")
+    common.add_argument("-v", "--verbose", action="store_true", help="同时输出网络请求等详细日志")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    scrape_parser = subparsers.add_parser("scrape", parents=[common], help="刮削指定目录或文件")
+    scrape_parser.add_argument("path", nargs="?", default="", help="待刮削目录或视频文件, 默认使用配置中的待刮削目录")
+    watch_parser = subparsers.add_parser("watch", parents=[common], help="监控目录, 刮削新增的视频文件")
+    watch_parser.add_argument("path", nargs="?", default="", help="监控目录, 默认使用配置中的待刮削目录")
+    return parser
+
+
+class _Output:
+    def __init__(self, json_lines, verbose):
+        self.json_lines = json_lines
+        self.verbose = verbose
+        self.lock = threading.Lock()
+
+    def write(self, record_type, text="", **kwargs):
+        with self.lock:
+            if self.json_lines:
+                record = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "type": record_type, "text": text}
+                record.update(kwargs)
+                print(json.dumps(record, ensure_ascii=False), flush=True)
+            elif text:
+                print(text, flush=True)
+
+    def log(self, text):
+        from models.signals import signal
+
+        # 详细日志在图形界面中由定时器读取, 命令行模式下随普通日志一起读取, 避免堆积
+        detail = signal.get_log()
+        if detail and self.verbose:
+            self.write("detail", detail)
+        self.write("log", text)
+
+    def result(self, filename, result, json_data, real_number=""):
+        self.write(
+            "result",
+            status="success" if result == "succ" else "failed",
+            file=json_data.get("file_path", ""),
+            number=json_data.get("number", real_number),
+            title=json_data.get("title", ""),
+            error=json_data.get("error_info", ""),
+        )
+
+
+def _setup(args):
+    """
+    各子命令共用的初始化: 读取配置、设置线程数量、连接日志及结果输出, 配置文件不存在时返回 None
+    """
+    import urllib3
+    from PIL import ImageFile
+
+    from models.config.config import config
+    from models.signals import signal
+
+    urllib3.disable_warnings()
+    ImageFile.LOAD_TRUNCATED_IMAGES = True  # 与 main.py 保持一致
+
+    if args.config:
+        if not os.path.isfile(args.config):
+            print(f"配置文件不存在: {args.config}", file=sys.stderr)
+            return None
+        config.read_config(args.config)
+    if args.thread > 0:
+        config.thread_number = args.thread
+
+    output = _Output(args.json, args.verbose)
+    signal.log_text.connect(output.log)
+    signal.exec_show_list_name.connect(output.result)
+    return output
+
+
+def scrape(args):
+    output = _setup(args)
+    if not output:
+        return 2
+
+    from models.config.config import config
+    from models.core.flags import Flags
+    from models.core.scraper import scrape as _scrape
+    from models.entity.enums import FileMode
+    from models.signals import signal
+
+    movie_list = None
+    if args.path:
+        path = os.path.realpath(args.path)
+        if os.path.isdir(path):
+            config.media_path = path
+        elif os.path.isfile(path):
+            movie_list = [path]
+        else:
+            print(f"路径不存在: {args.path}", file=sys.stderr)
+            return 2
+
+    try:
+        _scrape(FileMode.Default, movie_list)
+    except KeyboardInterrupt:
+        output.write("log", "⛔️ 已手动停止！")
+        signal.stop = True
+        Flags.stop_flag = True
+        if Flags.pool:
+            Flags.pool.shutdown39(wait=False, cancel_futures=True)
+        return 130
+    output.write(
+        "summary",
+        total=Flags.total_count,
+        success=Flags.succ_count,
+        failed=Flags.fail_count,
+    )
+    return 1 if Flags.fail_count else 0
+
+
+def watch(args):
+    output = _setup(args)
+    if not output:
+        return 2
+
+    from models.config.config import config
+    from models.core.scraper import scrape as _scrape
+    from models.core.utils import get_movie_path_setting
+    from models.core.watcher import MediaWatcher
+    from models.entity.enums import FileMode
+
+    if args.path:
+        if not os.path.isdir(args.path):
+            print(f"目录不存在: {args.path}", file=sys.stderr)
+            return 2
+        config.media_path = os.path.realpath(args.path)
+
+    def on_ready(movie_list):
+        # 在监控线程中同步刮削, 刮削期间到达的文件留到下次检查
+        _scrape(FileMode.Default, movie_list)
+        return True
+
+    watcher = MediaWatcher(on_ready)
+    watcher.start(get_movie_path_setting()[0])
+    if not watcher.running:
+        return 2
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        watcher.stop()
+        output.write("log", "⛔️ 已停止监控！")
+    return 0
+
+
+def main(argv=None):
+    args = _get_parser().parse_args(argv)
+    # 必须在导入 models 之前设置, 使信号使用不依赖 Qt 的实现
+    os.environ.setdefault("MDCX_HEADLESS", "1")
+    if args.command == "scrape":
+        return scrape(args)
+    if args.command == "watch":
+        return watch(args)
+    return 0
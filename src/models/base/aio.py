@@ -0,0 +1,86 @@
+"""
+异步网络请求引擎
+在专属线程中运行 asyncio 事件循环, 由 curl_cffi 的 AsyncSession 发出请求, 大量并发请求只占用一个线程
+同步代码通过 run/call 提交协程, 在事件循环中运行的代码可直接 await session 的请求
+此模块不依赖任何项目代码
+"""
+
+import asyncio
+import atexit
+import threading
+
+MAX_CONNECTIONS = 100  # 同时进行的请求数量上限, 超出时在 AsyncSession 中排队
+
+
+class AsyncEngine:
+    def __init__(self, max_connections=MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self.loop = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self._session = None
+        atexit.register(self.shutdown)
+
+    def _get_loop(self):
+        with self.lock:
+            if self.loop is None:
+                # curl_cffi 不支持 Windows 默认的 ProactorEventLoop
+                self.loop = asyncio.SelectorEventLoop()
+                self.thread = threading.Thread(target=self._run, name="MDCx-AsyncIO", daemon=True)
+                self.thread.start()
+            return self.loop
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def in_loop(self):
+        """
+        当前是否在事件循环线程中
+        """
+        return self.thread is threading.current_thread()
+
+    def run(self, coro):
+        """
+        提交协程, 返回 concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def call(self, coro, timeout=None):
+        """
+        提交协程并等待结果, 不可在事件循环线程中调用(会阻塞事件循环), 应直接 await
+        """
+        if self.in_loop():
+            coro.close()
+            raise RuntimeError("AsyncEngine.call 不可在事件循环线程中调用")
+        return self.run(coro).result(timeout)
+
+    @property
+    def session(self):
+        """
+        curl_cffi 的 AsyncSession, 仅可在事件循环线程中使用
+        """
+        if self._session is None:
+            from curl_cffi.requests import AsyncSession
+
+            self._session = AsyncSession(max_clients=self.max_connections)
+        return self._session
+
+    async def run_blocking(self, func, *args):
+        """
+        在线程池中执行阻塞操作(如写入文件), 避免阻塞事件循环
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def shutdown(self):
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(5)
+            except Exception:
+                pass
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,113 @@
+"""
+按域名熔断: 连续请求失败的域名暂停请求一段时间, 避免每个线程都等待 重试次数 × 超时时间
+关闭: 正常请求; 打开: 直接返回失败; 半开: 暂停时间结束后放行一个探测请求, 成功则关闭, 失败则再次打开且暂停时间翻倍
+此模块不依赖任何项目代码
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+FAILURE_THRESHOLD = 5  # 连续失败次数达到后打开
+OPEN_TIME = 30  # 首次打开的暂停时间(秒), 之后每次翻倍
+MAX_OPEN_TIME = 600
+MAX_RETRY_AFTER = 3600  # Retry-After 的最长暂停时间(秒)
+MAX_WAIT = 10  # 剩余暂停时间不超过此秒数时等待后请求, 否则直接返回失败
+BACKOFF_BASE = 1  # 重试间隔(秒), 第 n 次重试前随机等待 0 ~ BACKOFF_BASE * 2^(n-1) 秒
+MAX_BACKOFF = 30
+
+
+def parse_retry_after(value):
+    """
+    解析 Retry-After 响应头(秒数或 HTTP 日期), 返回秒数, 无法解析时返回 0
+    """
+    if not value:
+        return 0
+    value = str(value).strip()
+    if value.isdigit():
+        return min(int(value), MAX_RETRY_AFTER)
+    try:
+        return min(max(parsedate_to_datetime(value).timestamp() - time.time(), 0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def backoff(attempt):
+    """
+    第 attempt 次重试前的等待时间, 指数增长并随机抖动, 避免多个线程同时重试
+    """
+    return random.uniform(0, min(BACKOFF_BASE * 2 ** min(attempt - 1, 10), MAX_BACKOFF))
+
+
+class _HostState:
+    def __init__(self):
+        self.failures = 0  # 连续失败次数
+        self.open_count = 0  # 连续打开次数
+        self.open_until = 0  # 暂停请求的截止时间, 为 0 时表示关闭
+        self.probing = False  # 半开状态下是否已有探测请求
+
+
+class HostCircuitBreaker:
+    def __init__(self):
+        self.states = {}  # {host: _HostState}
+        self.lock = threading.Lock()
+
+    def acquire(self, url, max_wait=0):
+        """
+        请求前调用, 域名处于打开状态时最多等待 max_wait 秒
+
+        :return: 0 表示可以请求, 否则为仍需暂停的秒数
+        """
+        host = urlparse(url).netloc
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self.lock:
+                state = self.states.get(host)
+                if not state or not state.open_until:
+                    return 0
+                now = time.monotonic()
+                if now >= state.open_until and not state.probing:
+                    state.probing = True  # 半开, 放行一个探测请求
+                    return 0
+                wait_time = state.open_until - now if now < state.open_until else 0.5  # 等待探测结果
+            if now + wait_time > deadline:
+                return wait_time
+            time.sleep(wait_time)
+
+    def success(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            self.states.pop(host, None)
+
+    def failure(self, url, retry_after=0):
+        """
+        记录一次失败(网络错误、429、5xx), retry_after 为服务器要求的暂停秒数
+        """
+        host = urlparse(url).netloc
+        if not host:
+            return
+        with self.lock:
+            state = self.states.setdefault(host, _HostState())
+            now = time.monotonic()
+            state.failures += 1
+            if retry_after:
+                state.open_until = max(state.open_until, now + retry_after)
+            elif state.probing or state.failures >= FAILURE_THRESHOLD and now >= state.open_until:
+                state.open_count += 1
+                open_time = min(OPEN_TIME * 2 ** min(state.open_count - 1, 10), MAX_OPEN_TIME)
+                state.open_until = now + open_time * random.uniform(0.8, 1.2)
+            state.probing = False
+
+    def get_open_hosts(self):
+        """
+        返回暂停请求中的域名 [(域名, 剩余秒数, 连续失败次数)]
+        """
+        now = time.monotonic()
+        with self.lock:
+            return [
+                (host, max(state.open_until - now, 0), state.failures)
+                for host, state in sorted(self.states.items())
+                if state.open_until > now or state.probing
+            ]
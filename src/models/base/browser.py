@@ -0,0 +1,153 @@
+"""
+常驻的 Playwright 浏览器池
+sync_playwright 的对象只能在创建它的线程中使用, 因此每个浏览器由一个专属线程持有, 请求通过队列交给空闲的浏览器线程执行
+每个浏览器线程按域名保留 context 及页面, 导航一定次数后重启浏览器, cookies 等状态在重启后恢复
+"""
+
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+
+class BrowserPool:
+    def __init__(self, max_navigations=100, idle_timeout=300):
+        self.max_navigations = max_navigations  # 单个浏览器导航多少次后重启, 避免内存持续增长
+        self.idle_timeout = idle_timeout  # 浏览器线程空闲多少秒后关闭浏览器并退出
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.workers = []
+        self.idle = 0
+        self.count = 0
+        self.storage_states = {}  # {域名: storage_state}, 关闭 context 时保存, 新建时恢复
+        atexit.register(self.shutdown)
+
+    def submit(self, url, job, proxy=None, size=1):
+        """
+        提交任务, job(page) 在浏览器线程中执行, page 为该线程中 url 所属域名的页面
+
+        :param url: 目标地址, 用于选择页面
+        :param job: 接收 page 参数的函数, 返回值或异常通过 Future 传回
+        :param proxy: playwright 格式的代理, 与当前浏览器不同时重启浏览器
+        :param size: 浏览器线程数量上限
+        :return: Future
+        """
+        future = Future()
+        with self.lock:
+            self.queue.put((url, job, proxy, future))
+            if self.queue.qsize() > self.idle and len(self.workers) < max(size, 1):
+                self.count += 1
+                t = threading.Thread(target=self._worker, name=f"MDCx-Browser-{self.count}", daemon=True)
+                self.workers.append(t)
+                t.start()
+        return future
+
+    def shutdown(self, timeout=5):
+        with self.lock:
+            workers = list(self.workers)
+        for _ in workers:
+            self.queue.put(None)
+        for t in workers:
+            t.join(timeout)
+
+    def _worker(self):
+        p = None
+        browser = None
+        browser_proxy = None
+        pages = {}  # {域名: page}
+        navigations = 0
+        try:
+            while True:
+                with self.lock:
+                    self.idle += 1
+                try:
+                    task = self.queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    with self.lock:
+                        self.idle -= 1
+                        if self.queue.empty():  # 空闲超时, 在锁内确认没有新任务后退出
+                            self.workers.remove(threading.current_thread())
+                            return
+                    continue
+                with self.lock:
+                    self.idle -= 1
+                if task is None:
+                    with self.lock:
+                        self.workers.remove(threading.current_thread())
+                    return
+
+                url, job, proxy, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                domain = urlparse(url).netloc
+                try:
+                    # 浏览器异常断开、代理变化或导航次数达到上限时重启
+                    if browser and (
+                        not browser.is_connected() or browser_proxy != proxy or navigations >= self.max_navigations
+                    ):
+                        self._close_browser(browser, pages)
+                        browser = None
+                    if not browser:
+                        if not p:
+                            from playwright.sync_api import sync_playwright  # 首次使用时才加载, 加快启动速度
+
+                            p = sync_playwright().start()
+                        browser = p.chromium.launch(headless=True, proxy=proxy)
+                        browser_proxy = proxy
+                        navigations = 0
+                    page = pages.get(domain)
+                    if not page or page.is_closed():
+                        page = self._new_page(browser, domain)
+                        pages[domain] = page
+                    navigations += 1
+                    result = job(page)
+                except Exception as e:
+                    # 页面状态未知, 丢弃后下次重新创建
+                    page = pages.pop(domain, None)
+                    if page:
+                        self._close_context(domain, page)
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            self._close_browser(browser, pages)
+            if p:
+                try:
+                    p.stop()
+                except Exception:
+                    pass
+
+    def _new_page(self, browser, domain):
+        context = browser.new_context(storage_state=self.storage_states.get(domain))
+        page = context.new_page()
+        # 不加载图片、样式、字体
+        page.route(
+            "**/*",
+            lambda route: route.abort()
+            if route.request.resource_type in ["image", "stylesheet", "font"]
+            else route.continue_(),
+        )
+        return page
+
+    def _close_context(self, domain, page):
+        try:
+            state = page.context.storage_state()
+            with self.lock:
+                self.storage_states[domain] = state
+        except Exception:
+            pass
+        try:
+            page.context.close()
+        except Exception:
+            pass
+
+    def _close_browser(self, browser, pages):
+        for domain, page in pages.items():
+            self._close_context(domain, page)
+        pages.clear()
+        if browser:
+            try:
+                browser.close()
+            except Exception:
+                pass
@@ -5,6 +5,7 @@ import traceback
 
 from PIL import Image
 
+from models.base.image_probe import check_image
 from models.config.config import config
 from models.signals import signal
 
@@ -82,9 +83,14 @@ def open_image(pic_path):
 def check_pic(path_pic):
     if os.path.exists(path_pic):
         try:
-            with Image.open(path_pic) as img:  # 如果文件不是图片，报错
-                img.load()  # 如果图片不完整，报错OSError: image file is truncated
-                return img.size
+            size = check_image(path_pic)  # 仅读取文件头及结尾, 不解码像素
+            if size is None:  # 不支持的格式, 完整解码检查
+                with Image.open(path_pic) as img:  # 如果文件不是图片，报错
+                    img.load()  # 如果图片不完整，报错OSError: image file is truncated
+                    size = img.size
+            if not size:
+                raise OSError("image file is truncated")
+            return size
         except Exception as e:
             signal.add_log(f"文件损坏: {path_pic} \n Error: {e}")
             try:
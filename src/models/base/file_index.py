@@ -0,0 +1,161 @@
+"""
+待刮削目录的本地索引, 存放于 SQLite 数据库
+记录每个文件夹的修改时间、子文件夹及文件信息, 遍历时仅重新读取修改时间变化的文件夹, 其余文件夹直接使用索引
+文件夹内新增、删除、重命名文件都会更新该文件夹的修改时间, 因此未变化的文件夹无需读取
+此模块不依赖任何项目代码, 文件过滤及清理规则由调用方传入
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime INTEGER, skip INTEGER, subdirs TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, dir TEXT, ext TEXT, size INTEGER, mtime INTEGER, inode INTEGER, is_link INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+"""
+
+# 文件夹修改时间精度较低时(FAT 为 2 秒, 部分网络文件系统为 1 秒), 刚修改过的文件夹下次仍需重新读取
+MTIME_PRECISION = 2
+
+
+def _prefix_range(path):
+    """
+    以 path 开头的路径范围, 用于范围查询
+    """
+    return path, path + "\U0010ffff"
+
+
+class FileIndex:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self._conn = None
+        self.rescan_count = 0  # 最近一次遍历中重新读取的文件夹数量
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            folder = os.path.dirname(self.db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _check_signature(self, signature):
+        """
+        过滤规则变化时, 索引中的文件列表不再可靠, 将所有文件夹标记为需要重新读取
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        if row and row[0] == signature:
+            return
+        self.conn.execute("UPDATE dirs SET mtime = -1")
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", (signature,))
+
+    def _remove_tree(self, path):
+        self.conn.execute("DELETE FROM dirs WHERE path >= ? AND path < ?", _prefix_range(path))
+        self.conn.execute("DELETE FROM files WHERE path >= ? AND path < ?", _prefix_range(path))
+
+    def _rescan(self, path, old_subdirs, skip_names, on_file):
+        """
+        读取文件夹, 更新索引, 返回 (是否跳过, 子文件夹列表)
+        """
+        with os.scandir(path) as it:
+            entries = list(it)
+        names = {entry.name for entry in entries}
+        skip = any(each in names for each in skip_names)
+        subdirs = []
+        files = []
+        if not skip:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():  # 与 os.walk 一致, 不进入链接的文件夹
+                            subdirs.append(entry.name)
+                        continue
+                    file_path = path + entry.name
+                    if not on_file(file_path, entry.name):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    files.append((file_path, path, ext, st.st_size, st.st_mtime_ns, st.st_ino, int(entry.is_symlink())))
+                except OSError:
+                    continue
+        for each in set(old_subdirs) - set(subdirs):
+            self._remove_tree(path + each + "/")
+        self.conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+        self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", files)
+
+        # 清理文件后文件夹修改时间会变化, 因此处理完成后再读取
+        mtime = os.stat(path).st_mtime_ns
+        if time.time() - mtime / 1e9 < MTIME_PRECISION:
+            mtime = -1
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)", (path, mtime, int(skip), json.dumps(subdirs))
+        )
+        self.rescan_count += 1
+        return skip, subdirs
+
+    def walk(self, root, exts, exclude, on_file, skip_names=(), signature="", full=False, progress=None):
+        """
+        遍历 root 下的文件夹, 返回扩展名在 exts 中的文件 [(文件路径, 是否为链接)], 文件夹路径均以 / 结尾
+        :param exts: 小写扩展名列表, 如 [".mp4", ".mkv"]
+        :param exclude: exclude(folder) 返回 True 时忽略此文件夹及其子文件夹
+        :param on_file: on_file(file_path, file_name) 返回 False 时不记录此文件, 仅在重新读取文件夹时调用
+        :param skip_names: 文件夹中存在这些文件时, 忽略此文件夹及其子文件夹
+        :param signature: 过滤规则的标识, 变化时重新读取全部文件夹
+        :param full: 为 True 时忽略修改时间, 重新读取全部文件夹
+        :param progress: progress(rescan_count) 每重新读取 100 个文件夹调用一次
+        """
+        root = os.path.join(root, "").replace("\\", "/")
+        with self.lock, self.conn:
+            self.rescan_count = 0
+            self._check_signature(signature)
+            dir_dic = {}
+            for path, mtime, skip, subdirs in self.conn.execute(
+                "SELECT path, mtime, skip, subdirs FROM dirs WHERE path >= ? AND path < ?", _prefix_range(root)
+            ):
+                dir_dic[path] = (mtime, skip, subdirs)
+
+            visited = set()
+            stack = [root]
+            while stack:
+                path = stack.pop()
+                if exclude(path):
+                    continue
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    self._remove_tree(path)
+                    continue
+                old = dir_dic.get(path)
+                old_subdirs = json.loads(old[2]) if old else []
+                if old and not full and old[0] == mtime:
+                    skip, subdirs = old[1], old_subdirs
+                else:
+                    try:
+                        skip, subdirs = self._rescan(path, old_subdirs, skip_names, on_file)
+                    except OSError:
+                        continue
+                    if progress and self.rescan_count % 100 == 0:
+                        progress(self.rescan_count)
+                if skip:
+                    continue
+                visited.add(path)
+                stack.extend(path + each + "/" for each in subdirs)
+
+            file_list = []
+            exts = list(exts)
+            sql = "SELECT path, dir, is_link FROM files WHERE path >= ? AND path < ? AND ext IN (%s)"
+            for path, folder, is_link in self.conn.execute(
+                sql % ",".join("?" * len(exts)), (*_prefix_range(root), *exts)
+            ):
+                if folder in visited:
+                    file_list.append((path, bool(is_link)))
+        return file_list
@@ -0,0 +1,127 @@
+"""
+网络请求的本地缓存
+以请求内容的哈希值寻址, 响应经 zlib 压缩后存放于独立文件中, 按修改时间进行 LRU 淘汰
+此模块不依赖任何项目代码, 有效期及容量由调用方传入
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+
+class HttpCache:
+    def __init__(self, folder):
+        self.folder = folder
+        self.lock = threading.Lock()
+        self._index = None  # {key: [size, mtime]}, 首次使用时扫描缓存目录生成
+        self._total_size = 0
+
+    @staticmethod
+    def make_key(method, url, headers=None, cookies=None):
+        """
+        生成缓存键, 仅包含会影响响应内容的请求信息
+        """
+        parts = [method.upper(), url]
+        if headers:
+            lower_headers = {k.lower(): v for k, v in headers.items()}
+            for each in ["cookie", "accept-language"]:
+                if lower_headers.get(each):
+                    parts.append(f"{each}={lower_headers[each]}")
+        if cookies:
+            parts.append("cookies=" + ";".join(f"{k}={v}" for k, v in sorted(dict(cookies).items())))
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.folder, key[:2], key)
+
+    def get(self, key, ttl=None):
+        """
+        读取缓存, ttl 为 None 时忽略有效期(离线模式)
+
+        :return: (headers, content) 或 None
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+        meta, _, content = data.partition(b"\n")
+        try:
+            meta = json.loads(meta)
+        except ValueError:
+            return None
+        if ttl is not None and time.time() - meta.get("time", 0) > ttl:
+            return None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))  # 更新访问时间, 用于 LRU 淘汰
+        except OSError:
+            pass
+        with self.lock:
+            if self._index is not None and key in self._index:
+                self._index[key][1] = now
+        return meta.get("headers", {}), content
+
+    def set(self, key, url, headers, content, max_size):
+        """
+        写入缓存, 写入后总大小超过 max_size(字节)时, 淘汰最久未使用的缓存
+        """
+        meta = json.dumps({"url": url, "time": time.time(), "headers": dict(headers)}, ensure_ascii=False)
+        data = zlib.compress(meta.encode("utf-8") + b"\n" + content)
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)  # 先写临时文件再替换, 避免并发读取到不完整的缓存
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        with self.lock:
+            self._load_index()
+            old = self._index.get(key)
+            if old:
+                self._total_size -= old[0]
+            self._index[key] = [len(data), time.time()]
+            self._total_size += len(data)
+            if self._total_size > max_size:
+                self._evict(max_size * 0.9)
+
+    def _load_index(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        self._total_size = 0
+        if not os.path.isdir(self.folder):
+            return
+        for sub in os.scandir(self.folder):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                self._index[entry.name] = [stat.st_size, stat.st_mtime]
+                self._total_size += stat.st_size
+
+    def _evict(self, target_size):
+        for key, (size, _) in sorted(self._index.items(), key=lambda i: i[1][1]):
+            if self._total_size <= target_size:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._total_size -= size
+            del self._index[key]
@@ -2,15 +2,33 @@ import os
 import time
 import traceback
 
-from PIL import Image, ImageFilter
-from PyQt5.QtGui import QImageReader, QPixmap
+from PIL import Image
 
 from models.base.file import check_pic, copy_file, delete_file
+from models.base.image_ops import blur_background
+from models.base.image_probe import probe_file
+from models.base.image_pool import image_pool
 from models.base.utils import get_used_time
+from models.config.config import config
 from models.signals import signal
 
+try:
+    from turbojpeg import TJCS_GRAY, TJCS_YCbCr, TurboJPEG  # 可选依赖, 安装 PyTurboJPEG 后 JPEG 海报可无损裁剪
+except ImportError:
+    TurboJPEG = None
+    TJCS_YCbCr, TJCS_GRAY = 1, 2
+
+_turbo_jpeg = None
+# 各色度抽样方式的 MCU 尺寸, 按 TJSAMP_444, 422, 420, GRAY, 440, 411 的顺序
+MCU_SIZES = [(8, 8), (16, 8), (16, 16), (8, 8), (8, 16), (32, 8)]
+MAX_ALIGN_SHIFT = 0.02  # 对齐 MCU 时裁剪框最多移动裁剪宽度(高度)的比例
+# 可无损裁剪的色彩空间, CMYK/YCCK 等需由 Pillow 转为 RGB, 与 Pillow 裁剪的结果一致(部分媒体服务器无法显示 CMYK)
+LOSSLESS_COLORSPACES = (TJCS_YCbCr, TJCS_GRAY)
+
 
 def get_pixmap(pic_path, poster=True, pic_from=""):
+    from PyQt5.QtGui import QImageReader, QPixmap  # 仅图形界面使用, 无界面模式不加载 Qt
+
     try:
         # 使用 QImageReader 加载，适合加载大文件，pixmap适合显示
         # 判断是否可读取
@@ -51,18 +69,58 @@ def fix_size(path, naming_rule):
     try:
         poster_path = os.path.join(path, (naming_rule + "-poster.jpg"))
         if os.path.exists(poster_path):
-            pic = Image.open(poster_path)
-            (width, height) = pic.size
+            result = probe_file(poster_path)  # 仅读取文件头
+            if result and result[1] and result[2]:
+                (_, width, height) = result
+            else:  # 不支持的格式
+                with Image.open(poster_path) as pic:
+                    (width, height) = pic.size
             if not 2 / 3 - 0.05 <= width / height <= 2 / 3 + 0.05:  # 仅处理会过度拉伸的图片
-                fixed_pic = pic.resize((int(width), int(3 / 2 * width)))  # 拉伸图片
-                fixed_pic = fixed_pic.filter(ImageFilter.GaussianBlur(radius=50))  # 高斯模糊
-                fixed_pic.paste(pic, (0, int((3 / 2 * width - height) / 2)))  # 粘贴原图
-                fixed_pic.save(poster_path, quality=95, subsampling=0)
-            pic.close()
+                image_pool.run(poster_path, poster_path, [("letterbox", 2 / 3)])  # 拉伸模糊作为背景, 粘贴原图
     except:
         signal.show_log_text(f"{traceback.format_exc()}\n Pic: {poster_path}")
 
 
+def _get_turbo_jpeg():
+    global _turbo_jpeg
+    if _turbo_jpeg is None:
+        try:
+            _turbo_jpeg = TurboJPEG() if TurboJPEG else False
+        except Exception:  # 未找到 libturbojpeg
+            _turbo_jpeg = False
+    return _turbo_jpeg
+
+
+def lossless_crop(src, dst, box):
+    """
+    无损裁剪 JPEG(类似 jpegtran, 不解码重新编码), 裁剪框左上角需对齐 MCU, 偏差较小时自动对齐
+    未安装 PyTurboJPEG、不是 JPEG、色彩空间不是 YCbCr 或灰度、无法对齐时返回 False
+    """
+    jpeg = _get_turbo_jpeg()
+    if not jpeg:
+        return False
+    try:
+        with open(src, "rb") as f:
+            jpeg_buf = f.read()
+        width, height, subsample, colorspace = jpeg.decode_header(jpeg_buf)
+        if colorspace not in LOSSLESS_COLORSPACES:
+            return False
+        mcu_w, mcu_h = MCU_SIZES[subsample] if 0 <= subsample < len(MCU_SIZES) else (32, 16)
+        ax, ay, bx, by = (int(round(each)) for each in box)
+        x = round(ax / mcu_w) * mcu_w
+        y = round(ay / mcu_h) * mcu_h
+        if abs(x - ax) > (bx - ax) * MAX_ALIGN_SHIFT or abs(y - ay) > (by - ay) * MAX_ALIGN_SHIFT:
+            return False
+        w = min(bx - ax, width - x)
+        h = min(by - ay, height - y)
+        data = jpeg.crop(jpeg_buf, x, y, w, h)
+        with open(dst, "wb") as f:
+            f.write(data)
+        return True
+    except Exception:
+        return False
+
+
 def cut_thumb_to_poster(json_data, thumb_path, poster_path, image_cut=""):
     start_time = time.time()
     if os.path.exists(poster_path):
@@ -119,14 +177,19 @@ def cut_thumb_to_poster(json_data, thumb_path, poster_path, image_cut=""):
             if h == 472:
                 ax, ay, bx, by = 473, 0, 788, h
 
-    # 裁剪并保存
+    # 裁剪并保存, 可以无损裁剪时不重新编码
+    is_jpeg = img.format == "JPEG"
+    img.close()
     try:
-        img_new = img.convert("RGB")
-        img_new_png = img_new.crop((ax, ay, bx, by))
-        img_new_png.save(poster_path, quality=95, subsampling=0)
-        img.close()
+        if config.lossless_crop == "on" and is_jpeg and lossless_crop(thumb_path, poster_path, (ax, ay, bx, by)):
+            crop_mode = "lossless"
+        else:
+            image_pool.run(thumb_path, poster_path, [("crop", (ax, ay, bx, by))])
+            crop_mode = "pillow"
         if check_pic(poster_path):
-            json_data["logs"] += f"\n 🍀 Poster done! ({json_data['poster_from']})({get_used_time(start_time)}s)"
+            json_data["logs"] += (
+                f"\n 🍀 Poster done! ({json_data['poster_from']})({crop_mode})({get_used_time(start_time)}s)"
+            )
             return True
         json_data["logs"] += f'\n 🥺 Poster cut failed! ({json_data["poster_from"]})({get_used_time(start_time)}s)'
     except Exception as e:
@@ -193,8 +256,7 @@ def fix_pic(pic_path, new_path):
             backdrop_h = int((bx - ax) / 1.156)
             foreground_x = 0
             foreground_y = int(backdrop_h - (by - ay))
-        fixed_pic = pic.resize((backdrop_w, backdrop_h))  # 背景拉伸
-        fixed_pic = fixed_pic.filter(ImageFilter.GaussianBlur(radius=50))  # 背景高斯模糊
+        fixed_pic = blur_background(pic, (backdrop_w, backdrop_h))  # 背景拉伸并高斯模糊
         fixed_pic.paste(pic, (foreground_x, foreground_y))  # 粘贴原图
         fixed_pic = fixed_pic.convert("RGB")
         fixed_pic.save(new_path, quality=95, subsampling=0)
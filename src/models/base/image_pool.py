@@ -0,0 +1,98 @@
+"""
+图片处理进程池
+裁剪、模糊、水印、格式转换等耗 CPU 的操作交给子进程执行, 不受 GIL 限制, 刮削线程只传递文件路径及操作列表
+同时等待的任务数量有上限, 超出时提交任务的线程阻塞等待; 未启用或进程池异常时在当前线程执行
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from models.base.image_ops import process
+from models.config.config import config
+
+QUEUE_FACTOR = 2  # 同时提交的任务数量上限为进程数的倍数
+
+
+class ImagePool:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.workers = 0
+        self.slots = None
+        self.task_count = 0
+        self.error_count = 0
+        self.local_count = 0  # 在当前线程执行的任务数量
+        self.run_time = 0.0  # 任务执行总用时(包括进程间传递)
+        self.wait_time = 0.0  # 等待空闲位置的总用时
+
+    def _get_workers(self):
+        return config.image_processes if config.image_processes > 0 else max((os.cpu_count() or 2) - 1, 1)
+
+    def _get_executor(self):
+        workers = self._get_workers()
+        with self.lock:
+            if self.executor is None or self.workers != workers:
+                if self.executor is not None:
+                    self.executor.shutdown(wait=False)
+                # 使用 spawn 启动子进程, 避免在多线程进程中 fork
+                self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+                self.workers = workers
+                self.slots = threading.BoundedSemaphore(workers * QUEUE_FACTOR)
+            return self.executor, self.slots
+
+    def run(self, src, dst, ops, quality=95):
+        """
+        打开 src, 依次执行 ops 后保存到 dst, 阻塞至完成, 返回保存的图片尺寸, 处理失败时抛出异常
+        操作格式见 models.base.image_ops
+        """
+        if config.image_process != "on":
+            return self._run_local(src, dst, ops, quality)
+        start_time = time.time()
+        executor, slots = self._get_executor()
+        with slots:
+            wait_time = time.time() - start_time
+            try:
+                result = executor.submit(process, src, dst, ops, quality).result()
+            except BrokenProcessPool:  # 子进程异常退出, 重建进程池并在当前线程执行
+                with self.lock:
+                    if self.executor is executor:
+                        self.executor = None
+                return self._run_local(src, dst, ops, quality)
+            except Exception:
+                with self.lock:
+                    self.error_count += 1
+                raise
+            finally:
+                with self.lock:
+                    self.task_count += 1
+                    self.wait_time += wait_time
+                    self.run_time += time.time() - start_time - wait_time
+        return result
+
+    def _run_local(self, src, dst, ops, quality):
+        with self.lock:
+            self.local_count += 1
+        return process(src, dst, ops, quality)
+
+    def get_info(self):
+        with self.lock:
+            if not self.task_count:
+                return ""
+            return (
+                f" 🖼 图片进程池（{self.workers} 进程）: 任务 {self.task_count}  失败 {self.error_count}  "
+                f"平均用时 {self.run_time / self.task_count:.2f}s  平均等待 {self.wait_time / self.task_count:.2f}s"
+                + (f"  当前线程执行 {self.local_count}" if self.local_count else "")
+            )
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+image_pool = ImagePool()
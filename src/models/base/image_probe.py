@@ -0,0 +1,178 @@
+"""
+仅读取文件头获取图片格式及尺寸, 检查文件结尾判断图片是否完整, 不解码像素
+支持 JPEG(SOF)、PNG(IHDR)、GIF、WebP(VP8/VP8L/VP8X)
+此模块不依赖任何项目代码
+"""
+
+import os
+import struct
+
+HEAD_SIZE = 64 * 1024  # 通常足够读取到 JPEG 的 SOF, EXIF 较大时继续读取
+MAX_HEAD_SIZE = 1024 * 1024
+TAIL_SIZE = 4096  # JPEG 结束标记后可能有少量附加数据
+
+# 除 DHT(C4)、JPG(C8)、DAC(CC) 外的 SOF 标记
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class NeedMoreData(Exception):
+    """
+    数据不足以解析出尺寸
+    """
+
+
+def _jpeg_markers(data):
+    """
+    依次返回 JPEG 各标记的 (标记, 位置), 数据不足时抛出 NeedMoreData, 格式错误时结束
+    """
+    pos = 2
+    while True:
+        if pos + 4 > len(data):
+            raise NeedMoreData
+        if data[pos] != 0xFF:
+            return
+        marker = data[pos + 1]
+        if marker == 0xFF:  # 填充字节
+            pos += 1
+            continue
+        yield marker, pos
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # 无长度的标记
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):  # 结束或扫描开始, 之后不再是标记段
+            return
+        pos += 2 + struct.unpack(">H", data[pos + 2 : pos + 4])[0]
+
+
+def _probe_jpeg(data):
+    for marker, pos in _jpeg_markers(data):
+        if marker in _SOF_MARKERS:
+            if pos + 9 > len(data):
+                raise NeedMoreData
+            height, width = struct.unpack(">HH", data[pos + 5 : pos + 9])
+            return width, height
+    return None  # 结束或扫描开始前仍未找到 SOF
+
+
+def _find_jpeg_sos(data):
+    """
+    返回扫描开始(SOS)标记的位置, 未找到时返回 None
+    """
+    for marker, pos in _jpeg_markers(data):
+        if marker == 0xDA:
+            return pos
+    return None
+
+
+def _probe_webp(data):
+    if len(data) < 30:
+        raise NeedMoreData
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = struct.unpack("<I", data[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def probe(data):
+    """
+    根据文件开头的数据获取图片格式及尺寸, 返回 (格式, 宽, 高), 未找到尺寸时宽高为 0, 不是支持的图片格式时返回 None
+    :raise NeedMoreData: 数据不足, 需要读取更多数据
+    """
+    if len(data) < 12:
+        raise NeedMoreData
+    if data[:2] == b"\xff\xd8":
+        return ("JPEG", *(_probe_jpeg(data) or (0, 0)))
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) < 24:
+            raise NeedMoreData
+        return ("PNG", *struct.unpack(">II", data[16:24])) if data[12:16] == b"IHDR" else ("PNG", 0, 0)
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return ("GIF", *struct.unpack("<HH", data[6:10]))
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ("WEBP", *(_probe_webp(data) or (0, 0)))
+    return None
+
+
+def _read_head(path, parse):
+    """
+    读取文件开头的数据交给 parse 解析, 数据不足时继续读取, 文件结束或超过 MAX_HEAD_SIZE 时抛出 NeedMoreData
+    """
+    with open(path, "rb") as f:
+        data = f.read(HEAD_SIZE)
+        while True:
+            try:
+                return parse(data)
+            except NeedMoreData:
+                more = f.read(len(data)) if len(data) < MAX_HEAD_SIZE else b""
+                if not more:
+                    raise
+                data += more
+
+
+def probe_file(path):
+    """
+    读取文件头获取图片格式及尺寸, 返回 (格式, 宽, 高), 不是支持的图片格式时返回 None
+    文件在读取到尺寸前结束时返回 ("", 0, 0)
+    """
+    try:
+        return _read_head(path, probe)
+    except NeedMoreData:
+        return "", 0, 0
+
+
+def is_complete(path, image_format, sos_offset=0):
+    """
+    检查文件结尾判断图片是否完整: JPEG 的 EOI 标记、PNG 的 IEND 块、GIF 的结束符、WebP 的 RIFF 长度
+    JPEG 的 EOI 须位于 sos_offset(扫描开始)之后, 排除 EXIF 缩略图的 EOI; 结尾附加了较多数据(如 MPF)未找到 EOI 时返回 None
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if image_format == "WEBP":
+            riff_size = struct.unpack("<I", f.read(8)[4:8])[0]
+            return file_size >= riff_size + 8
+        tail_start = max(file_size - TAIL_SIZE, 0)
+        f.seek(tail_start)
+        tail = f.read()
+    if image_format == "JPEG":
+        index = tail.rfind(b"\xff\xd9")
+        if index < 0:
+            return None
+        return tail_start + index > sos_offset
+    if image_format == "PNG":
+        return b"IEND" in tail[-64:]
+    if image_format == "GIF":
+        return tail.rstrip(b"\x00")[-1:] == b"\x3b"
+    return True
+
+
+def check_image(path):
+    """
+    检查图片文件, 返回 (宽, 高); 不完整或尺寸为 0 时返回 False
+    不是支持的图片格式、或无法仅凭文件结尾判断是否完整时返回 None, 由调用方使用其他方式检查
+    """
+    result = probe_file(path)
+    if not result:
+        return None
+    image_format, width, height = result
+    if not width or not height:
+        return False
+    sos_offset = 0
+    if image_format == "JPEG":
+        try:
+            sos_offset = _read_head(path, _find_jpeg_sos)
+        except NeedMoreData:
+            return False
+        if sos_offset is None:
+            return False
+    complete = is_complete(path, image_format, sos_offset)
+    if complete is None:
+        return None
+    return (width, height) if complete else False
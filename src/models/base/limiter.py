@@ -0,0 +1,77 @@
+"""
+按域名限制请求频率的令牌桶
+此模块不依赖任何项目代码, 限速规则由调用方传入
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate  # 每秒补充的令牌数
+        self.capacity = max(burst, 1)  # 桶容量, 即允许的突发请求数
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        取出一个令牌, 令牌不足时预支, 返回需要等待的秒数, 先到的请求先放行
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+    def acquire(self):
+        """
+        取出一个令牌, 令牌不足时休眠至令牌补足
+        """
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+class HostRateLimiter:
+    def __init__(self):
+        self.buckets = {}  # {host: (rule, TokenBucket)}
+        self.lock = threading.Lock()
+
+    def acquire(self, url, rules):
+        """
+        按域名限速, 未匹配到规则的域名不限速
+
+        :param url: 请求地址
+        :param rules: [(网站关键词, 每秒请求数, 突发数)], 关键词包含在域名中即视为匹配
+        :return: 等待的秒数
+        """
+        wait_time = self.reserve(url, rules)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def reserve(self, url, rules):
+        """
+        与 acquire 相同, 但不休眠, 返回需要等待的秒数, 供异步请求使用
+        """
+        host = urlparse(url).netloc
+        if not host:
+            return 0
+        for rule in rules:
+            if rule[0] in host:
+                break
+        else:
+            return 0
+        with self.lock:
+            old = self.buckets.get(host)
+            if old and old[0] == rule:
+                bucket = old[1]
+            else:  # 首次请求或规则已修改
+                bucket = TokenBucket(rule[1], rule[2])
+                self.buckets[host] = (rule, bucket)
+        return bucket.reserve()
@@ -0,0 +1,93 @@
+"""
+网站刮削结果的本地缓存, 存放于 SQLite 数据库
+以 (网站, 番号, 语言, 其他参数) 为键, 保存爬虫解析后的数据及获取时间, 重新刮削时可直接使用未过期的数据
+同时记录网站没有某番号的结果, 再次检查的间隔随连续未找到的次数倍增
+此模块不依赖任何项目代码, 有效期由调用方传入
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    website TEXT, number TEXT, language TEXT, extra TEXT, data TEXT, fetch_time REAL,
+    PRIMARY KEY (website, number, language, extra)
+);
+CREATE TABLE IF NOT EXISTS miss (
+    website TEXT, number TEXT, extra TEXT, count INTEGER, next_time REAL,
+    PRIMARY KEY (website, number, extra)
+);
+"""
+
+
+class MetadataCache:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            folder = os.path.dirname(self.db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def get(self, website, number, language, extra="", ttl=None):
+        """
+        获取缓存数据, 不存在或超过有效期(秒)时返回 (None, 0), 否则返回 (数据, 获取时间)
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, fetch_time FROM metadata WHERE website = ? AND number = ? AND language = ? AND extra = ?",
+                (website, number.upper(), language, extra),
+            ).fetchone()
+        if not row or (ttl is not None and time.time() - row[1] > ttl):
+            return None, 0
+        return json.loads(row[0]), row[1]
+
+    def set(self, website, number, language, extra, data):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)",
+                (website, number.upper(), language, extra, json.dumps(data, ensure_ascii=False), time.time()),
+            )
+
+    def get_miss(self, website, number, extra=""):
+        """
+        网站没有此番号时, 返回下次检查的时间, 否则返回 0
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT next_time FROM miss WHERE website = ? AND number = ? AND extra = ?",
+                (website, number.upper(), extra),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def add_miss(self, website, number, extra, interval, max_interval):
+        """
+        记录网站没有此番号, 第 n 次未找到时, interval * 2^(n-1) 秒内不再检查, 最长 max_interval 秒
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT count FROM miss WHERE website = ? AND number = ? AND extra = ?",
+                (website, number.upper(), extra),
+            ).fetchone()
+            count = row[0] + 1 if row else 1
+            next_time = time.time() + min(interval * 2 ** min(count - 1, 30), max_interval)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO miss VALUES (?, ?, ?, ?, ?)", (website, number.upper(), extra, count, next_time)
+            )
+
+    def remove_miss(self, website, number, extra=""):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM miss WHERE website = ? AND number = ? AND extra = ?", (website, number.upper(), extra)
+            )
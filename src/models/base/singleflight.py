@@ -0,0 +1,82 @@
+"""
+合并相同的并发请求
+同一时刻参数相同的调用只执行一次, 其余调用等待并共享其结果
+此模块不依赖任何项目代码
+"""
+
+import copy
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+
+
+def _freeze(value):
+    """
+    将参数转换为可哈希的形式
+    """
+    if isinstance(value, dict) or hasattr(value, "items"):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # {key: Future}
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        执行 func, 若已有相同 key 的调用正在执行, 则等待其完成并返回结果的副本
+        """
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.calls[key] = future
+        if not leader:
+            return copy.deepcopy(future.result())  # 返回副本, 避免调用方修改共享的结果
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            with self.lock:
+                self.calls.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self.lock:
+            self.calls.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def wrap(self, skip=None):
+        """
+        装饰器, 以函数名及全部参数(不含 self)作为 key 合并调用
+
+        :param skip: 接收参数字典的函数, 返回 True 时不合并, 直接调用
+        """
+
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                arguments.pop("self", None)
+                if skip and skip(arguments):
+                    return func(*args, **kwargs)
+                try:
+                    key = (func.__qualname__, _freeze(arguments))
+                    hash(key)
+                except TypeError:  # 参数无法哈希时不合并
+                    return func(*args, **kwargs)
+                return self.do(key, func, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
+import asyncio
+import json
+import os
+import queue
 import re
 import socket
 import threading
 import traceback
 from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from threading import Lock
 from urllib.parse import quote
 from urllib.parse import urlparse
 
@@ -33,11 +36,20 @@ from requests.exceptions import (
     TooManyRedirects,
     URLRequired,
 )
-
+from requests.structures import CaseInsensitiveDict
+
+from models.base.aio import AsyncEngine
+from models.base.breaker import MAX_WAIT, HostCircuitBreaker, backoff, parse_retry_after
+from models.base.browser import BrowserPool
+from models.base.http_cache import HttpCache
+from models.base.image_pool import image_pool
+from models.base.image_probe import NeedMoreData, probe
+from models.base.limiter import HostRateLimiter
+from models.base.singleflight import SingleFlight
 from models.base.utils import get_user_agent, singleton
 from models.config.config import config
+from models.config.resources import resources
 from models.signals import signal
-from playwright.sync_api import sync_playwright
 
 
 def _allowed_gai_family():
@@ -54,6 +66,14 @@ try:
 except:
     urllib3_cn.allowed_gai_family = _allowed_gai_family
 
+MAX_DOWNLOAD_WORKERS = 8  # 单个文件分段下载的连接数
+PART_SECONDS = 4  # 每个分段的预期下载时间(秒)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+PROBE_RANGE_SIZES = [16 * 1024, 256 * 1024]  # 获取图片尺寸时依次请求的范围, 文件头较大(如 EXIF)时再次请求
+
+# 合并同时发出的相同请求(如多个分集同时刮削同一番号)
+_flight = SingleFlight()
+
 
 @singleton
 class WebRequests:
@@ -63,10 +83,203 @@ class WebRequests:
         self.session_g.mount("http://", requests.adapters.HTTPAdapter(pool_connections=100, pool_maxsize=100))
         # self.scraper = cloudscraper.create_scraper(
         #     browser={'browser': 'firefox', 'platform': 'windows', 'mobile': False})  # returns a CloudScraper instance
-        self.lock = Lock()
         self.pool = ThreadPoolExecutor(32)
         self.curl_session = curl_cffi.requests.Session(max_redirects=10)
+        self.http_cache = HttpCache(resources.userdata_path("http_cache"))
+        self.limiter = HostRateLimiter()
+        self.breaker = HostCircuitBreaker()
+        self.aio = AsyncEngine()
+        self.download_speed = 0  # 分段下载时单个连接的平均速度(字节/秒)
+        self.wait_local = threading.local()  # 各线程在熔断及限速上等待的总时间
+        self.browser_pool = BrowserPool()
+
+    def wait_rate_limit(self, url):
+        """
+        按 config.rate_limit 设置的规则限速, 每次发出请求(包括重试)前调用
+        """
+        return self.limiter.acquire(url, config.rate_limit_list)
+
+    def before_request(self, url):
+        """
+        每次发出请求(包括重试)前调用: 检查熔断并限速, 域名暂停请求中时返回错误信息, 否则返回空字符串
+        """
+        start_time = time.time()
+        try:
+            if config.circuit_breaker == "on":
+                wait_time = self.breaker.acquire(url, MAX_WAIT)
+                if wait_time:
+                    return f"{urlparse(url).netloc} 连续请求失败，暂停请求中（剩余 {wait_time:.0f}s） {url}"
+            self.wait_rate_limit(url)
+            return ""
+        finally:
+            self.wait_local.total = self.get_wait_time() + time.time() - start_time
+
+    def get_wait_time(self):
+        """
+        返回当前线程在 before_request 中等待的总时间(秒), 统计网站用时时扣除, 不计入我们自己的限速
+        """
+        return getattr(self.wait_local, "total", 0.0)
+
+    def record_success(self, url):
+        """
+        服务器有响应(429 及 5xx 除外)时调用
+        """
+        if config.circuit_breaker == "on":
+            self.breaker.success(url)
+
+    def record_failure(self, url, attempt, retry_times, response=None):
+        """
+        网络错误、429 及 5xx 时调用, 还可重试时等待: 优先使用 Retry-After, 否则指数退避
+        """
+        wait_time = self._get_retry_wait(url, attempt, retry_times, response)
+        if wait_time:
+            time.sleep(wait_time)
+
+    def _get_retry_wait(self, url, attempt, retry_times, response=None):
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else 0
+        if config.circuit_breaker == "on":
+            self.breaker.failure(url, retry_after)
+            if retry_after:  # 由 before_request 等待或直接返回失败
+                return 0
+        if attempt + 1 < retry_times:
+            return min(retry_after, MAX_WAIT) if retry_after else backoff(attempt + 1)
+        return 0
+
+    async def async_before_request(self, url):
+        """
+        before_request 的异步版本, 等待时不阻塞事件循环
+        """
+        if config.circuit_breaker == "on":
+            deadline = time.monotonic() + MAX_WAIT
+            while True:
+                wait_time = self.breaker.acquire(url)
+                if not wait_time:
+                    break
+                if time.monotonic() + wait_time > deadline:
+                    return f"{urlparse(url).netloc} 连续请求失败，暂停请求中（剩余 {wait_time:.0f}s） {url}"
+                await asyncio.sleep(wait_time)
+        wait_time = self.limiter.reserve(url, config.rate_limit_list)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return ""
+
+    async def async_get(self, url, headers=None, cookies=None, proxies=True, timeout=False, impersonate=None):
+        """
+        异步 GET 请求, 须在 self.aio 的事件循环中 await, 重试、熔断及限速规则与 get_html 相同
+        同步代码使用 aio_get_html 或 self.aio.call(self.async_get(...))
+
+        :return: (响应头, 二进制内容), 失败时返回 (False, 错误信息)
+        """
+        retry_times = config.retry
+        proxies = config.proxies if proxies else None
+        if not headers:
+            headers = config.headers
+        headers = _site_headers(url, headers)
+        if not timeout:
+            timeout = config.timeout
+
+        signal.add_log(f"🔎 请求 {url}")
+        error_info = ""
+        for i in range(int(retry_times)):
+            error_info = await self.async_before_request(url)
+            if error_info:
+                break
+            try:
+                response = await self.aio.session.get(
+                    url,
+                    headers=headers,
+                    cookies=cookies,
+                    proxies=proxies,
+                    timeout=timeout,
+                    verify=False,
+                    impersonate=impersonate,
+                )
+                if response.status_code < 300:
+                    signal.add_log(f"✅ 成功 {url}")
+                    self.record_success(url)
+                    return response.headers, response.content
+                error_info = f"{response.status_code} {url}"
+                signal.add_log(f"🔴 重试 [{i + 1}/{retry_times}] {error_info}")
+                if _is_host_failure(response.status_code):
+                    await asyncio.sleep(self._get_retry_wait(url, i, retry_times, response))
+                else:
+                    self.record_success(url)
+            except Exception as e:
+                error_info = f"{url}\nError: {e}"
+                signal.add_log(f"[{i + 1}/{retry_times}] {error_info}")
+                await asyncio.sleep(self._get_retry_wait(url, i, retry_times))
+        signal.add_log(f"🔴 请求失败！{error_info}")
+        return False, error_info
 
+    async def async_get_html(self, url, headers=None, cookies=None, proxies=True, json_data=False, encoding="utf-8"):
+        """
+        异步获取网页文本或 json, 返回值与 get_html 相同
+        """
+        _header, body = await self.async_get(url, headers=headers, cookies=cookies, proxies=proxies)
+        if not _header:
+            return False, body
+        try:
+            body = body.decode(encoding, errors="replace")
+            return _header, json.loads(body) if json_data else body
+        except ValueError as e:
+            return False, f"{url}\nError: {e}"
+
+    async def async_download(self, url, file_path):
+        """
+        异步下载文件, 写入文件在线程池中执行
+        """
+        _header, content = await self.async_get(url)
+        if not _header:
+            return False
+        try:
+            await self.aio.run_blocking(_save_content, file_path, content, _is_webp(url, file_path))
+            return True
+        except Exception as e:
+            signal.add_log(f"🔴 保存失败！{file_path}\nError: {e}")
+            return False
+
+    def aio_get_html(self, url, headers=None, cookies=None, proxies=True, json_data=False, encoding="utf-8"):
+        """
+        async_get_html 的同步版本, 供爬虫等同步代码使用
+        """
+        return self.aio.call(self.async_get_html(url, headers, cookies, proxies, json_data, encoding))
+
+    def download_many(self, task_list):
+        """
+        在事件循环中并发下载多个文件, 返回与 task_list 顺序一致的结果列表
+
+        :param task_list: [(url, file_path)]
+        """
+
+        async def run():
+            return await asyncio.gather(*[self.async_download(url, file_path) for url, file_path in task_list])
+
+        return self.aio.call(run())
+
+    def _get_cache(self, url, headers=None, cookies=None):
+        """
+        查询网络请求缓存
+        :return: (缓存键, (headers, content)), 未启用缓存或该网站不缓存时缓存键为 None
+        """
+        if config.http_cache not in ["on", "offline"]:
+            return None, None
+        offline = config.http_cache == "offline"
+        ttl = _get_cache_ttl(url)
+        if not ttl and not offline:
+            return None, None
+        cache_key = HttpCache.make_key("GET", url, headers, cookies)
+        cached = self.http_cache.get(cache_key, None if offline else ttl)
+        if cached:
+            _header = CaseInsensitiveDict(cached[0])
+            _header["X-MDCx-Cache"] = "hit"  # 标记来自缓存, 同时保证 headers 不为空
+            cached = _header, cached[1]
+        return cache_key, cached
+
+    def _set_cache(self, cache_key, url, headers, content):
+        if cache_key and config.http_cache == "on":
+            self.http_cache.set(cache_key, url, headers, content, config.http_cache_size * 1024**2)
+
+    @_flight.wrap(skip=lambda kw: kw["res"] or kw["back_cookie"])  # 响应对象及 cookies 不共享
     def get_html(
         self,
         url: str,
@@ -96,32 +309,31 @@ class WebRequests:
             headers = config.headers
         if not timeout:
             timeout = config.timeout
-        if "getchu" in url:
-            headers_o = {
-                "Referer": "http://www.getchu.com/top.html",
-            }
-            headers.update(headers_o)
-        elif "xcity" in url:
-            headers_o = {
-                "referer": "https://xcity.jp/result_published/?genre=%2Fresult_published%2F&q=2&sg=main&num=60",
-            }
-            headers.update(headers_o)
-        # javbus封面图需携带refer，refer似乎没有做强校验，但须符合格式要求，否则403
-        elif "javbus" in url:
-            headers_o = {
-                "Referer": "https://www.javbus.com/",
-            }
-            headers.update(headers_o)
-        elif "giga" in url:
-            # 搜索时需要携带refer，获取cookies时不能携带
-            giga_refer = "" if "cookie_set.php" in url else "https://www.giga-web.jp/top.html"
-            headers_o = {
-                "Referer": giga_refer,
-            }
-            headers.update(headers_o)
+        headers = _site_headers(url, headers)
+
+        # 查询缓存, 需要返回原始响应、cookies 或二进制内容的请求不使用缓存
+        cache_key = None
+        if not res and not content and not back_cookie:
+            cache_key, cached = self._get_cache(url, headers, cookies)
+            if cached:
+                _header, body = cached
+                try:
+                    body = body.decode(encoding, errors="replace")
+                    body = json.loads(body) if json_data else body
+                    signal.add_log(f"💾 缓存 {url}")
+                    return _header, body
+                except ValueError:
+                    pass
+            if cache_key and config.http_cache == "offline":
+                error_info = f"离线模式，缓存中无此请求 {url}"
+                signal.add_log(f"🔴 请求失败！{error_info}")
+                return False, error_info
 
         signal.add_log(f"🔎 请求 {url}")
         for i in range(int(retry_times)):
+            error_info = self.before_request(url)
+            if error_info:
+                break
             try:
                 if keep:
                     response = self.session_g.get(
@@ -154,20 +366,33 @@ class WebRequests:
                     else:
                         error_info = f"{response.status_code} {url}"
                         signal.add_log(f"🔴 重试 [{i + 1}/{retry_times}] {error_info}")
+                        if _is_host_failure(response.status_code):
+                            self.record_failure(url, i, retry_times, response)
+                        else:
+                            self.record_success(url)
                         continue
                 else:
                     signal.add_log(f"✅ 成功 {url}")
-                if res:
-                    return _header, response
-                if content:
-                    return _header, response.content
-                response.encoding = encoding
-                if json_data:
-                    return _header, response.json()
-                return _header, response.text
+                self.record_success(url)
             except Exception as e:
                 error_info = f"{url}\nError: {e}"
                 signal.add_log(f"[{i + 1}/{retry_times}] {error_info}")
+                self.record_failure(url, i, retry_times)
+            else:
+                # 服务器已正常响应, 解析失败时重试, 但不计入熔断
+                try:
+                    if res:
+                        return _header, response
+                    if content:
+                        return _header, response.content
+                    response.encoding = encoding
+                    body = response.json() if json_data else response.text
+                    if response.status_code < 300:
+                        self._set_cache(cache_key, url, response.headers, response.content)
+                    return _header, body
+                except Exception as e:
+                    error_info = f"{url}\nError: {e}"
+                    signal.add_log(f"[{i + 1}/{retry_times}] {error_info}")
         signal.add_log(f"🔴 请求失败！{error_info}")
         return False, error_info
 
@@ -181,7 +406,7 @@ class WebRequests:
             css_selector=None
     ):
         """
-        创建 Playwright 页面对象并导航到目标 URL，同时支持提取页面中的 URL 列表。
+        使用浏览器池中常驻的 Playwright 页面导航到目标 URL，同时支持提取页面中的 URL 列表。
         参数:
             url (str): 目标页面的 URL。
             headers (dict): 请求头配置。
@@ -250,42 +475,39 @@ class WebRequests:
         elif proxies is False:
             proxies = None
         
-        # 启动浏览器并设置代理
-        p = sync_playwright().start()
-        browser = None
-        context = None
-        try:
-            browser = p.chromium.launch(headless=True, proxy=proxies)
-            context = browser.new_context()
-            # 设置请求头
-            if not headers:
-                headers = config.headers
-            context.set_extra_http_headers(headers)
-            
+        # 设置请求头
+        if not headers:
+            headers = config.headers
+        # 设置超时时间
+        if not timeout:
+            timeout = config.timeout * 1000
+
+        def run(page):
+            """
+            在浏览器线程中执行, 页面及其 context 由浏览器池复用
+            """
+            nonlocal url
+            page.context.set_extra_http_headers(headers)
             # 添加 Cookies
             if cookies:
-                cookies = convert_cookies(cookies, url)
-                context.add_cookies(cookies)
-            
-            # 设置超时时间
-            if not timeout:
-                timeout = config.timeout * 1000
-            
-            # 创建页面
-            page = context.new_page()
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "stylesheet", "font"] else route.continue_())
-            
+                page.context.add_cookies(convert_cookies(cookies, url))
+
             attempt = 0
             while attempt < config.retry:
                 attempt += 1
                 try:
                     signal.add_log(f"🔎 请求 {url}")
+                    error_info = self.before_request(url)
+                    if error_info:
+                        signal.add_log(f"🔴 页面导航失败! {error_info}")
+                        return None, []
                     page.goto(url, wait_until="domcontentloaded", timeout=timeout)
-                    
+                    self.record_success(url)
+
                     # 统一处理 URL 末尾的斜杠
                     url = url.rstrip("/") + "/"
                     actual_url = page.url.rstrip("/") + "/"
-                    
+
                     # 判断重定向
                     if actual_url != url:
                         return actual_url, []
@@ -299,30 +521,28 @@ class WebRequests:
                     if css_selector:
                         # 等待元素加载
                         page.wait_for_selector(css_selector, state="attached", timeout=timeout)
-                        
+
                         # 提取匹配的 href 属性值
                         url_list = page.eval_on_selector_all(
                             css_selector,
                             """(anchors) => Array.from(anchors).map(a => a.href)"""
                         )
-                    
+
                     return actual_url, url_list
-                
+
                 except Exception as e:
                     error_info = f"{url}\nError: {e}"
+                    self.record_failure(url, attempt - 1, config.retry)
                     if attempt < config.retry:
                         signal.add_log(f"🔴 重试 [{attempt}/{config.retry}] {error_info}")
                     else:
                         signal.add_log(f"🔴 页面导航失败! {error_info}")
                         return None, []
-        finally:
-            # 确保资源正确释放
-            if context:
-                context.close()
-            if browser:
-                browser.close()
-            p.stop()
-    
+            return None, []
+
+        # 交给常驻浏览器执行，浏览器数量不超过刮削线程数
+        return self.browser_pool.submit(url, run, proxy=proxies, size=config.thread_number).result()
+
     def post_html(
         self, url: str, data=None, json=None, headers=None, cookies=None, proxies=True, json_data=False, keep=True
     ):
@@ -341,6 +561,9 @@ class WebRequests:
 
         signal.add_log(f"🔎 POST请求 {url}")
         for i in range(int(retry_times)):
+            error_info = self.before_request(url)
+            if error_info:
+                break
             try:
                 if keep:
                     response = self.session_g.post(
@@ -367,16 +590,28 @@ class WebRequests:
                 if response.status_code > 299:
                     error_info = f"{response.status_code} {url}"
                     signal.add_log(f"🔴 重试 [{i + 1}/{retry_times}] {error_info}")
+                    if _is_host_failure(response.status_code):
+                        self.record_failure(url, i, retry_times, response)
+                    else:
+                        self.record_success(url)
                     continue
                 else:
                     signal.add_log(f"✅ POST成功 {url}")
-                response.encoding = "utf-8"
-                if json_data:
-                    return True, response.json()
-                return True, response.text
+                self.record_success(url)
             except Exception as e:
                 error_info = f"{url}\nError: {e}"
                 signal.add_log(f"[{i + 1}/{retry_times}] {error_info}")
+                self.record_failure(url, i, retry_times)
+            else:
+                # 服务器已正常响应, 解析失败时重试, 但不计入熔断
+                try:
+                    response.encoding = "utf-8"
+                    if json_data:
+                        return True, response.json()
+                    return True, response.text
+                except Exception as e:
+                    error_info = f"{url}\nError: {e}"
+                    signal.add_log(f"[{i + 1}/{retry_times}] {error_info}")
         signal.add_log(f"🔴 请求失败！{error_info}")
         return False, error_info
 
@@ -420,13 +655,16 @@ class WebRequests:
         retry_times = config.retry
         headers = config.headers
 
-        for _ in range(int(retry_times)):
+        for i in range(int(retry_times)):
+            if self.before_request(url):
+                break
             try:
                 response = self.session_g.head(url, headers=headers, proxies=proxies, timeout=timeout, verify=False)
+                self.record_success(url)
                 file_size = response.headers.get("Content-Length")
                 return file_size
             except:
-                pass
+                self.record_failure(url, i, retry_times)
         return False
 
     def multi_download(self, url, file_path):
@@ -434,88 +672,130 @@ class WebRequests:
         file_size = self._get_filesize(url)
 
         # 判断是不是webp文件
-        webp = False
-        if file_path.endswith("jpg") and ".webp" in url:
-            webp = True
+        webp = _is_webp(url, file_path)
 
         # 没有大小时，不支持分段下载，直接下载；< 2 MB 的直接下载
         MB = 1024**2
         if not file_size or int(file_size) <= 2 * MB or webp:
             result, response = get_html(url, content=True)
             if result:
-                if webp:
-                    byte_stream = BytesIO(response)
-                    img = Image.open(byte_stream)
-                    if img.mode == "RGBA":
-                        img = img.convert("RGB")
-                    img.save(file_path, quality=95, subsampling=0)
-                    img.close()
-                else:
-                    with open(file_path, "wb") as f:
-                        f.write(response)
+                _save_content(file_path, response, webp)
                 return True
             return False
 
         return self._multi_download2(url, file_path, int(file_size))
 
     def _multi_download2(self, url, file_path, file_size) -> bool:
-        # 分块，每块 1 MB
-        MB = 1024**2
-        file_size = int(file_size)
-        each_size = min(int(1 * MB), file_size)
-        parts = [(s, min(s + each_size, file_size)) for s in range(0, file_size, each_size)]
-        # print(f'分块数：{len(parts)} \n')
-
-        # 先写入一个文件
-        f = open(file_path, "wb")
-        f.truncate(file_size)
-        f.close()
-
-        # 开始下载
-        i = 0
-        task_list = []
-        for part in parts:
-            i += 1
-            start, end = part
-            task_list.append([start, end, i, url, file_path])
-        result = self.pool.map(self._start_download, task_list)
-        for res in result:
-            if not res:
-                # bar.close()
-                return False
-        # bar.close()
+        """
+        分段并发下载到 file_path.part, 各段直接写入对应位置, 校验大小后重命名为 file_path
+        已完成的分段记录在 file_path.part.json 中, 下载中断后再次下载时跳过
+        """
+        part_path = file_path + ".part"
+        progress_path = part_path + ".json"
+        progress = _load_progress(progress_path, url, file_size)
+        if progress and os.path.exists(part_path) and os.path.getsize(part_path) == file_size:
+            part_size = progress["part_size"]
+            done = set(progress["done"])
+        else:
+            part_size = self._get_part_size(file_size)
+            done = set()
+            with open(part_path, "wb") as f:
+                f.truncate(file_size)
+        parts = [s for s in range(0, file_size, part_size) if s not in done]
+        part_count = len(done) + len(parts)
+
+        part_queue = queue.Queue()
+        for each in parts:
+            part_queue.put(each)
+        progress_lock = threading.Lock()
+        failed = threading.Event()
+
+        def worker():
+            # 每个线程使用独立的文件句柄写入, 无需加锁
+            with open(part_path, "r+b") as f:
+                while not failed.is_set():
+                    try:
+                        start = part_queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    if not self._download_range(url, f, start, min(start + part_size, file_size)):
+                        failed.set()
+                        return
+                    with progress_lock:
+                        done.add(start)
+                        _save_progress(progress_path, url, file_size, part_size, done)
+
+        worker_count = max(min(len(parts), MAX_DOWNLOAD_WORKERS), 1)
+        start_time = time.time()
+        for future in [self.pool.submit(worker) for _ in range(worker_count)]:
+            future.result()
+        downloaded = sum(min(s + part_size, file_size) - s for s in parts if s in done)
+        used_time = time.time() - start_time
+        if downloaded and used_time > 0:
+            speed = downloaded / used_time / worker_count
+            self.download_speed = speed if not self.download_speed else self.download_speed * 0.7 + speed * 0.3
+
+        if failed.is_set() or len(done) != part_count:
+            return False
+        if os.path.getsize(part_path) != file_size:  # 校验大小
+            for each in [part_path, progress_path]:
+                if os.path.exists(each):
+                    os.remove(each)
+            return False
+        os.replace(part_path, file_path)
+        if os.path.exists(progress_path):
+            os.remove(progress_path)
         return True
 
-    def _start_download(self, task) -> bool:
-        start, end, i, url, file_path = task
+    def _get_part_size(self, file_size):
+        """
+        根据最近测得的单个连接下载速度确定分段大小, 使每段约需 PART_SECONDS 秒
+        """
+        MB = 1024**2
+        part_size = int(self.download_speed * PART_SECONDS) if self.download_speed else MB
+        part_size = min(max(part_size, MB), 16 * MB)
+        return min(part_size, max(file_size // MAX_DOWNLOAD_WORKERS, MB))  # 保证分段数量足够多个连接同时下载
 
+    def _download_range(self, url, f, start, end) -> bool:
+        """
+        下载 [start, end) 范围的内容, 边下载边写入文件
+        """
         proxies = config.proxies
         timeout = config.timeout
         retry_times = config.retry
-        headers = config.headers
-        _headers = headers.copy()
-        _headers["Range"] = f"bytes={start}-{end}"
-        for _ in range(int(retry_times)):
+        _headers = config.headers.copy()
+        _headers["Range"] = f"bytes={start}-{end - 1}"
+        for i in range(int(retry_times)):
+            if self.before_request(url):
+                break
             try:
-                response = self.session_g.get(
+                with self.session_g.get(
                     url, headers=_headers, proxies=proxies, timeout=timeout, verify=False, stream=True
-                )
-                chunk_size = 128
-                chunks = []
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    chunks.append(chunk)  # bar.update(chunk_size)
-                self.lock.acquire()
-                with open(file_path, "rb+") as fp:
-                    fp.seek(start)
-                    for chunk in chunks:
-                        fp.write(chunk)
-                    self.lock.release()
-                del chunks
+                ) as response:
+                    if _is_host_failure(response.status_code):
+                        self.record_failure(url, i, retry_times, response)
+                        continue
+                    self.record_success(url)  # 服务器已响应, 先记录以结束熔断的试探请求, 之后的提前返回不会遗漏
+                    # 服务器不支持分段时, 仅当请求的范围是整个文件才可使用
+                    if response.status_code != 206 and not (response.status_code == 200 and start == 0):
+                        signal.add_log(f"🔴 分段下载失败！{response.status_code} {url}")
+                        return False
+                    offset = start
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        chunk = chunk[: end - offset]
+                        _write_at(f, chunk, offset)
+                        offset += len(chunk)
+                        if offset >= end:
+                            break
+                if offset != end:
+                    raise OSError(f"分段大小不一致 {offset - start}/{end - start}")
                 return True
-            except:
-                pass
+            except Exception as e:
+                signal.add_log(f"[{i + 1}/{retry_times}] {url}\nError: {e}")
+                self.record_failure(url, i, retry_times)
         return False
 
+    @_flight.wrap()
     def curl_html(self, url, headers=None, proxies=True, cookies=None):
         """
         curl请求(模拟浏览器指纹)
@@ -530,31 +810,43 @@ class WebRequests:
                 "https": None,
             }
 
+        encoding = "Shift_JIS" if "amazon" in url else "UTF-8"
+        cache_key, cached = self._get_cache(url, headers, cookies)
+        if cached:
+            signal.add_log(f"💾 缓存 {url}")
+            return cached[0], cached[1].decode(encoding, errors="replace")
+        if cache_key and config.http_cache == "offline":
+            error_info = f"离线模式，缓存中无此请求 {url}"
+            signal.add_log(f"🔴 请求失败！{error_info}")
+            return False, error_info
+
         signal.add_log(f"🔎 请求 {url}")
         for i in range(int(retry_times)):
+            error_info = self.before_request(url)
+            if error_info:
+                break
             try:
                 response = self.curl_session.get(
                     url_encode(url), headers=headers, cookies=cookies, proxies=proxies, impersonate="chrome120"
                 )
-                if "amazon" in url:
-                    response.encoding = "Shift_JIS"
-                else:
-                    response.encoding = "UTF-8"
+                response.encoding = encoding
                 if response.status_code == 200:
                     signal.add_log(f"✅ 成功 {url}")
+                    self.record_success(url)
+                    self._set_cache(cache_key, url, response.headers, response.content)
                     return response.headers, response.text
                 else:
                     error_info = f"{response.status_code} {url}"
-                    if response.status_code == 429:
-                        retry_after = (i + 1) * 2
-                        time.sleep(retry_after)
-                        signal.add_log(f"🔴 {retry_after}s后重试 [{i + 1}/{retry_times}] {error_info}")
+                    signal.add_log(f"🔴 重试 [{i + 1}/{retry_times}] {error_info}")
+                    if _is_host_failure(response.status_code):
+                        self.record_failure(url, i, retry_times, response)
                     else:
-                        signal.add_log(f"🔴 重试 [{i + 1}/{retry_times}] {error_info}")
+                        self.record_success(url)
                     continue
             except Exception as e:
                 error_info = f"{url}\nError: {e}"
                 signal.add_log(f"[{i + 1}/{retry_times}] {error_info}")
+                self.record_failure(url, i, retry_times)
                 continue
         signal.add_log(f"🔴 请求失败！{error_info}")
         return False, error_info
@@ -567,6 +859,90 @@ post_html = web.post_html
 scraper_html = web.curl_html
 multi_download = web.multi_download
 curl_html = web.curl_html
+aio_get_html = web.aio_get_html
+download_many = web.download_many
+
+
+def _is_webp(url, file_path):
+    return file_path.endswith("jpg") and ".webp" in url
+
+
+def _save_content(file_path, content, webp=False):
+    """
+    保存下载的内容, webp 图片由图片进程池转为 jpg
+    """
+    with open(file_path, "wb") as f:
+        f.write(content)
+    if webp:
+        image_pool.run(file_path, file_path, [])
+
+
+def _write_at(f, data, offset):
+    """
+    在文件的指定位置写入, 支持 pwrite 时不改变文件句柄的位置
+    """
+    if hasattr(os, "pwrite"):
+        os.pwrite(f.fileno(), data, offset)
+    else:
+        f.seek(offset)
+        f.write(data)
+
+
+def _load_progress(progress_path, url, file_size):
+    """
+    读取分段下载进度, 网址或文件大小不一致时返回 None
+    """
+    try:
+        with open(progress_path, encoding="utf-8") as f:
+            progress = json.load(f)
+        if progress["url"] == url and progress["size"] == file_size:
+            return progress
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _save_progress(progress_path, url, file_size, part_size, done):
+    temp_path = progress_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"url": url, "size": file_size, "part_size": part_size, "done": sorted(done)}, f)
+    os.replace(temp_path, progress_path)
+
+
+def _site_headers(url, headers):
+    """
+    部分网站需要携带 Referer, 返回添加后的请求头副本, 同步及异步请求共用
+    """
+    headers = dict(headers)
+    if "getchu" in url:
+        headers["Referer"] = "http://www.getchu.com/top.html"
+    elif "xcity" in url:
+        headers["referer"] = "https://xcity.jp/result_published/?genre=%2Fresult_published%2F&q=2&sg=main&num=60"
+    # javbus封面图需携带refer，refer似乎没有做强校验，但须符合格式要求，否则403
+    elif "javbus" in url:
+        headers["Referer"] = "https://www.javbus.com/"
+    elif "giga" in url:
+        # 搜索时需要携带refer，获取cookies时不能携带
+        headers["Referer"] = "" if "cookie_set.php" in url else "https://www.giga-web.jp/top.html"
+    return headers
+
+
+def _is_host_failure(status_code):
+    """
+    429 及 5xx 表示服务器过载或不可用, 计入熔断; 其他状态码说明服务器正常响应
+    """
+    return status_code == 429 or status_code >= 500
+
+
+def _get_cache_ttl(url):
+    """
+    获取网址对应的缓存有效期(秒), 按网站关键词匹配域名, 未匹配时使用 * 的设置
+    """
+    host = urlparse(url).netloc
+    for key, ttl in config.http_cache_ttl_dic.items():
+        if key != "*" and key in host:
+            return ttl
+    return config.http_cache_ttl_dic.get("*", 0)
 
 
 def url_encode(url):
@@ -578,6 +954,7 @@ def url_encode(url):
     return new_url
 
 
+@_flight.wrap()
 def check_url(url, length=False, real_url=False):
     proxies = config.proxies
     timeout = config.timeout
@@ -605,10 +982,18 @@ def check_url(url, length=False, real_url=False):
         headers.update(headers_o)
 
     for j in range(retry_times):
+        error_info = web.before_request(url)
+        if error_info:
+            signal.add_log(f"🔴 检测未通过！ {error_info}")
+            return 0
         try:
             r = requests.head(
                 url, headers=headers, proxies=proxies, timeout=timeout, verify=False, allow_redirects=True
             )
+            if _is_host_failure(r.status_code):
+                web.record_failure(url, j, retry_times, r)
+            else:
+                web.record_success(url)
 
             # 不输出获取 dmm预览视频(trailer) 最高分辨率的测试结果到日志中
             # get_dmm_trailer() 函数在多条错误的链接中找最高分辨率的链接，错误没有必要输出，避免误解为网络或软件问题
@@ -652,6 +1037,7 @@ def check_url(url, length=False, real_url=False):
             # 获取文件大小。如果没有获取到文件大小或 状态码 = 405，尝试下载15k数据，如果失败，视为不可用
             content_length = r.headers.get("Content-Length")
             if not content_length or r.status_code == 405:
+                web.wait_rate_limit(true_url)
                 response = requests.get(
                     true_url, headers=headers, proxies=proxies, timeout=timeout, verify=False, stream=True
                 )
@@ -705,6 +1091,7 @@ def check_url(url, length=False, real_url=False):
         except Exception as e:
             error_info = f" Error ({e}) {url}"
         signal.add_log(f"🔴 重试 [{j + 1}/{retry_times}] {error_info}")
+        web.record_failure(url, j, retry_times)
     signal.add_log(f"🔴 检测未通过！ {url}")
     return 0
 
@@ -785,28 +1172,55 @@ if "__main__" == __name__:
         pass
 
 
+@_flight.wrap()
 def get_imgsize(url):
+    """
+    使用 Range 请求仅下载图片开头的数据, 解析文件头获取尺寸, 获取失败时返回 (0, 0)
+    """
     proxies = config.proxies
     timeout = config.timeout
     retry_times = config.retry
-    headers = config.headers
 
-    for _ in range(int(retry_times)):
-        try:
-            response = requests.get(url, headers=headers, proxies=proxies, timeout=timeout, verify=False, stream=True)
-            if response.status_code == 200:
-                file_head = BytesIO()
-                chunk_size = 1024 * 10
-                for chunk in response.iter_content(chunk_size):
-                    file_head.write(chunk)
-                    response.close()
-                    try:
-                        img = Image.open(file_head)
-                        return img.size
-                    except:
+    data = b""
+    for range_size in PROBE_RANGE_SIZES:
+        headers = config.headers.copy()
+        headers["Range"] = f"bytes={len(data)}-{range_size - 1}"
+        head = data  # 之前已读取的数据, 每次重试从此处接着读取, 丢弃失败时读取的部分
+        for i in range(int(retry_times)):
+            data = head
+            if web.before_request(url):
+                return 0, 0
+            try:
+                with web.session_g.get(
+                    url, headers=headers, proxies=proxies, timeout=timeout, verify=False, stream=True
+                ) as response:
+                    if _is_host_failure(response.status_code):
+                        web.record_failure(url, i, retry_times, response)
                         continue
-        except:
-            continue
+                    web.record_success(url)
+                    if response.status_code == 200:  # 服务器不支持 Range, 读取到尺寸后断开
+                        data = b""
+                    elif response.status_code != 206:
+                        return 0, 0
+                    for chunk in response.iter_content(16 * 1024):
+                        data += chunk
+                        try:
+                            result = probe(data)
+                        except NeedMoreData:
+                            continue
+                        if result is None:  # 不支持的格式
+                            try:
+                                return Image.open(BytesIO(data)).size
+                            except Exception:
+                                continue
+                        return result[1:]
+                break
+            except Exception:
+                web.record_failure(url, i, retry_times)
+        else:
+            return 0, 0
+        if response.status_code == 200:
+            break
     return 0, 0
 
 
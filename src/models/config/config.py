@@ -63,8 +63,16 @@ class MDCxConfig(GeneratedConfig, ManualConfig):
         else:
             return self.mark_file_name
 
-    def read_config(self):
-        self._get_config_path()
+    def read_config(self, path=None):
+        """
+        读取配置文件
+
+        :param path: 配置文件路径, 为空时读取 MDCx.config 中记录的配置文件
+        """
+        if path:
+            self.path = os.path.realpath(path)
+        else:
+            self._get_config_path()
         reader = RawConfigParser()
         reader.read(self.path, encoding="UTF-8")
         for section in reader.sections():
@@ -123,6 +131,11 @@ clean_enable = {self.clean_enable}
 thread_number = {self.thread_number}
 thread_time = {self.thread_time}
 javdb_time = {self.javdb_time}
+crawler_fanout = {self.crawler_fanout}
+stage_limit = {self.stage_limit}
+image_process = {self.image_process}
+image_processes = {self.image_processes}
+lossless_crop = {self.lossless_crop}
 main_mode = {self.main_mode}
 read_mode = {self.read_mode}
 update_mode = {self.update_mode}
@@ -289,6 +302,15 @@ type = {self.type}
 proxy = {self.proxy}
 timeout = {self.timeout}
 retry = {self.retry}
+http_cache = {self.http_cache}
+http_cache_size = {self.http_cache_size}
+http_cache_ttl = {self.http_cache_ttl}
+metadata_cache = {self.metadata_cache}
+metadata_cache_ttl = {self.metadata_cache_ttl}
+negative_cache = {self.negative_cache}
+website_adaptive = {self.website_adaptive}
+rate_limit = {self.rate_limit}
+circuit_breaker = {self.circuit_breaker}
 {custom_website_config.strip()}
 theporndb_api_token = {self.theporndb_api_token}
 # type: no, http, socks5
@@ -311,6 +333,9 @@ localdisk_path = {self.localdisk_path}
 window_title = {self.window_title}
 switch_on = {self.switch_on}
 timed_interval = {self.timed_interval}
+watch_mode = {self.watch_mode}
+watch_stable_time = {self.watch_stable_time}
+file_index = {self.file_index}
 rest_count = {self.rest_count}
 rest_time = {self.rest_time}
 statement = {self.statement}
@@ -340,6 +365,36 @@ statement = {self.statement}
         self.ipv4_only = "ipv4_only" in self.switch_on
         self.theporndb_no_hash = "theporndb_no_hash" in self.switch_on
 
+        # 网络请求缓存有效期(秒), 配置格式: 网站关键词:小时, * 表示其他网站
+        self.http_cache_ttl_dic = {}
+        for each in re.split(r"[,，]", self.http_cache_ttl):
+            key, _, hours = each.partition(":")
+            try:
+                self.http_cache_ttl_dic[key.strip()] = float(hours) * 3600
+            except ValueError:
+                pass
+
+        # 获取网站限速规则 [(关键词, 每秒请求数, 突发数)]
+        self.rate_limit_list = []
+        for each in re.split(r"[,，]", self.rate_limit):
+            temp = each.strip().split(":")
+            try:
+                rate = float(temp[1])
+                burst = int(temp[2]) if len(temp) > 2 else 1
+            except (IndexError, ValueError):
+                continue
+            if temp[0].strip() and rate > 0:
+                self.rate_limit_list.append((temp[0].strip(), rate, burst))
+
+        # 获取刮削各阶段的并发数量 {阶段: 数量}
+        self.stage_limit_dic = {}
+        for each in re.split(r"[,，]", self.stage_limit):
+            key, _, limit = each.partition(":")
+            try:
+                self.stage_limit_dic[key.strip()] = max(int(limit), 1)
+            except ValueError:
+                pass
+
         # 获取User-Agent
         self.headers = {
             "User-Agent": get_user_agent(),
@@ -45,6 +45,11 @@ class GeneratedConfig:
     thread_number = 10
     thread_time = 0
     javdb_time = 10
+    crawler_fanout = 0
+    stage_limit = r"crawl:8,download:16,image:2,disk:2"
+    image_process = r"on"
+    image_processes = 0
+    lossless_crop = r"on"
     main_mode = 1
     read_mode = r""
     update_mode = r"c"
@@ -208,6 +213,15 @@ class GeneratedConfig:
     proxy = r"127.0.0.1:7890"
     timeout = 10
     retry = 3
+    http_cache = r"off"
+    http_cache_size = 1024
+    http_cache_ttl = r"javdb:24,javbus:72,dmm:168,*:72"
+    metadata_cache = r"on"
+    metadata_cache_ttl = 7
+    negative_cache = r"on"
+    website_adaptive = r"off"
+    rate_limit = r"javdb:1:1"
+    circuit_breaker = r"on"
     theporndb_api_token = r""
 
     # Cookies
@@ -227,6 +241,9 @@ class GeneratedConfig:
     window_title = r"hide"
     switch_on = r"rest_scrape,remain_task,show_dialog_stop_scrape,show_logs,ipv4_only,hide_none,"
     timed_interval = r"00:30:00"
+    watch_mode = r"off"
+    watch_stable_time = 10
+    file_index = r"on"
     rest_count = 20
     rest_time = r"00:01:02"
     statement = 3
@@ -265,6 +282,11 @@ clean_enable = {clean_enable}
 thread_number = {thread_number}
 thread_time = {thread_time}
 javdb_time = {javdb_time}
+crawler_fanout = {crawler_fanout}
+stage_limit = {stage_limit}
+image_process = {image_process}
+image_processes = {image_processes}
+lossless_crop = {lossless_crop}
 main_mode = {main_mode}
 read_mode = {read_mode}
 update_mode = {update_mode}
@@ -430,6 +452,15 @@ type = {type}
 proxy = {proxy}
 timeout = {timeout}
 retry = {retry}
+http_cache = {http_cache}
+http_cache_size = {http_cache_size}
+http_cache_ttl = {http_cache_ttl}
+metadata_cache = {metadata_cache}
+metadata_cache_ttl = {metadata_cache_ttl}
+negative_cache = {negative_cache}
+website_adaptive = {website_adaptive}
+rate_limit = {rate_limit}
+circuit_breaker = {circuit_breaker}
 theporndb_api_token = {theporndb_api_token}
 # type: no, http, socks5
 
@@ -451,6 +482,9 @@ localdisk_path = {localdisk_path}
 window_title = {window_title}
 switch_on = {switch_on}
 timed_interval = {timed_interval}
+watch_mode = {watch_mode}
+watch_stable_time = {watch_stable_time}
+file_index = {file_index}
 rest_count = {rest_count}
 rest_time = {rest_time}
 statement = {statement}"""
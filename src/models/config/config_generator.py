@@ -57,6 +57,11 @@ clean_enable = {clean_enable}
 thread_number = {thread_number}
 thread_time = {thread_time}
 javdb_time = {javdb_time}
+crawler_fanout = {crawler_fanout}
+stage_limit = {stage_limit}
+image_process = {image_process}
+image_processes = {image_processes}
+lossless_crop = {lossless_crop}
 main_mode = {main_mode}
 read_mode = {read_mode}
 update_mode = {update_mode}
@@ -222,6 +227,15 @@ type = {type}
 proxy = {proxy}
 timeout = {timeout}
 retry = {retry}
+http_cache = {http_cache}
+http_cache_size = {http_cache_size}
+http_cache_ttl = {http_cache_ttl}
+metadata_cache = {metadata_cache}
+metadata_cache_ttl = {metadata_cache_ttl}
+negative_cache = {negative_cache}
+website_adaptive = {website_adaptive}
+rate_limit = {rate_limit}
+circuit_breaker = {circuit_breaker}
 theporndb_api_token = {theporndb_api_token}
 # type: no, http, socks5
 
@@ -243,6 +257,9 @@ localdisk_path = {localdisk_path}
 window_title = {window_title}
 switch_on = {switch_on}
 timed_interval = {timed_interval}
+watch_mode = {watch_mode}
+watch_stable_time = {watch_stable_time}
+file_index = {file_index}
 rest_count = {rest_count}
 rest_time = {rest_time}
 statement = {statement}"""
@@ -32,6 +32,11 @@ class ManualConfig:
         "statement",
         "actor_photo_kodi_auto",
         "auto_link",
+        "http_cache_size",
+        "crawler_fanout",
+        "watch_stable_time",
+        "metadata_cache_ttl",
+        "image_processes",
     ]
     FLOAT_KEY = [
         "file_size",
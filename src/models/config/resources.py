@@ -1,11 +1,13 @@
+import importlib
 import json
 import os
+import pickle
 import sys
+import time
 import traceback
+from functools import cached_property
 
 import zhconv
-from PyQt5.QtGui import QFontDatabase
-from lxml import etree
 
 from models.base.file import copy_file
 from models.base.path import get_main_path
@@ -14,6 +16,56 @@ from models.config.config import config
 from models.signals import signal
 
 
+# 与原 XPath 查询中 translate() 的转换规则一致: 小写及全角字母转为大写半角, ・ 转为 ·
+_KEYWORD_TRANS = str.maketrans(
+    "abcdefghijklmnopqrstuvwxyzａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺ・",
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZABCDEFGHIJKLMNOPQRSTUVWXYZABCDEFGHIJKLMNOPQRSTUVWXYZ·",
+)
+
+
+CACHE_VERSION = 1  # 缓存数据结构变化时修改, 使旧缓存失效
+
+
+def _load_json(path):
+    with open(path, encoding="UTF-8") as f:
+        return json.load(f)
+
+
+def _load_zhconv_json(path):
+    # 与 zhconv.loaddict 的处理一致
+    zhcdicts = _load_json(path)
+    zhcdicts["SIMPONLY"] = frozenset(zhcdicts["SIMPONLY"])
+    zhcdicts["TRADONLY"] = frozenset(zhcdicts["TRADONLY"])
+    return zhcdicts
+
+
+def _parse_mapping(path):
+    from lxml import etree
+
+    parser = etree.HTMLParser(encoding="utf-8")
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    return _build_mapping_index(etree.HTML(content.encode("utf-8"), parser=parser))
+
+
+def _build_mapping_index(xml):
+    """
+    将映射表编译为 ({关键词: 记录}, [(转换后的 keyword, 记录)]), 记录为 <a> 标签的属性字典
+    keyword 中前后都有逗号的名字才能被查询到; 同一名字出现在多条记录中时, 按文件顺序取第一条
+    """
+    keyword_dic = {}
+    record_list = []
+    if xml is None or not len(xml):
+        return keyword_dic, record_list
+    for each in xml.iter("a"):
+        record = dict(each.attrib)
+        keyword = record.get("keyword", "").translate(_KEYWORD_TRANS)
+        record_list.append((keyword, record))
+        for name in keyword.split(",")[1:-1]:
+            keyword_dic.setdefault(name, record)
+    return keyword_dic, record_list
+
+
 @singleton
 class Resources:
     def __init__(self):
@@ -61,12 +113,8 @@ class Resources:
         # endregion
 
         self._check_userdata()
-        self.actor_mapping_data = None  # 演员映射表数据
-        self.info_mapping_data = None  # 信息映射表数据
-        self.sehua_title_data = None  # 色花数据
-        self._get_or_generate_local_data()
         self._get_mark_icon()
-        zhconv.loaddict(self._resource_path("zhconv/zhcdict.json"))  # 加载繁简转换字典
+        self._load_zhconv_dict()
 
     def get_actor_data(self, actor):
         # 初始化数据
@@ -80,23 +128,14 @@ class Resources:
         }
 
         # 查询映射表
-        xml_actor = self.actor_mapping_data
-        if len(xml_actor):
-            actor_name = ",%s," % actor.upper()
-            for each in config.full_half_char:
-                actor_name = actor_name.replace(each[0], each[1])
-            actor_ob = xml_actor.xpath(
-                '//a[contains(translate(@keyword, "abcdefghijklmnopqrstuvwxyzａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺ・", "ABCDEFGHIJKLMNOPQRSTUVWXYZABCDEFGHIJKLMNOPQRSTUVWXYZABCDEFGHIJKLMNOPQRSTUVWXYZ·"), $name)]',
-                name=actor_name,
-            )
-            if actor_ob:
-                actor_ob = actor_ob[0]
-                actor_data["zh_cn"] = actor_ob.get("zh_cn")
-                actor_data["zh_tw"] = actor_ob.get("zh_tw")
-                actor_data["jp"] = actor_ob.get("jp")
-                actor_data["keyword"] = actor_ob.get("keyword").strip(",").split(",")
-                actor_data["href"] = actor_ob.get("href")
-                actor_data["has_name"] = True
+        actor_ob = self._find_mapping(self.actor_mapping_index, actor)
+        if actor_ob:
+            actor_data["zh_cn"] = actor_ob.get("zh_cn")
+            actor_data["zh_tw"] = actor_ob.get("zh_tw")
+            actor_data["jp"] = actor_ob.get("jp")
+            actor_data["keyword"] = actor_ob.get("keyword").strip(",").split(",")
+            actor_data["href"] = actor_ob.get("href")
+            actor_data["has_name"] = True
         return actor_data
 
     def get_info_data(self, info):
@@ -110,26 +149,32 @@ class Resources:
         }
 
         # 查询映射表
-        xml_info = self.info_mapping_data
-        if len(xml_info):
-            info_name = ",%s," % info.upper()
-            for each in config.full_half_char:
-                info_name = info_name.replace(each[0], each[1])
-            info_ob = xml_info.xpath(
-                "//a[contains(translate(@keyword, "
-                '"abcdefghijklmnopqrstuvwxyzａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺ・", '
-                '"ABCDEFGHIJKLMNOPQRSTUVWXYZABCDEFGHIJKLMNOPQRSTUVWXYZABCDEFGHIJKLMNOPQRSTUVWXYZ·"), $name)]',
-                name=info_name,
-            )
-            if info_ob:
-                info_ob = info_ob[0]
-                info_data["zh_cn"] = info_ob.get("zh_cn").replace("删除", "")
-                info_data["zh_tw"] = info_ob.get("zh_tw").replace("删除", "")
-                info_data["jp"] = info_ob.get("jp").replace("删除", "")
-                info_data["keyword"] = info_ob.get("keyword").strip(",").split(",")
-                info_data["has_name"] = True
+        info_ob = self._find_mapping(self.info_mapping_index, info)
+        if info_ob:
+            info_data["zh_cn"] = info_ob.get("zh_cn").replace("删除", "")
+            info_data["zh_tw"] = info_ob.get("zh_tw").replace("删除", "")
+            info_data["jp"] = info_ob.get("jp").replace("删除", "")
+            info_data["keyword"] = info_ob.get("keyword").strip(",").split(",")
+            info_data["has_name"] = True
         return info_data
 
+    @staticmethod
+    def _find_mapping(mapping_index, name):
+        """
+        在映射表中查找 keyword 包含 name 的记录, 不存在时返回 None
+        """
+        keyword_dic, record_list = mapping_index
+        name = ",%s," % name.upper()
+        for each in config.full_half_char:
+            name = name.replace(each[0], each[1])
+        key = name[1:-1]
+        if "," not in key:
+            return keyword_dic.get(key)
+        # 名字中包含逗号时可能跨越多个关键词, 按原始的包含关系逐条查找
+        for keyword, record in record_list:
+            if name in keyword:
+                return record
+
     def _get_path(self):
         self._resources_base_path = os.path.join(get_main_path(), "resources")
         if getattr(sys, "frozen", False):  # 是否Bundle Resource，是否打包成exe运行
@@ -155,6 +200,8 @@ class Resources:
         return os.path.join(self._userdata_base_path, relative_path).replace("\\", "/")
 
     def get_fonts(self):
+        from PyQt5.QtGui import QFontDatabase  # 仅图形界面使用, 无界面模式不加载 Qt
+
         font_db = QFontDatabase()
         font_folder_path = self._resource_path("fonts")
         for f in os.listdir(font_folder_path):
@@ -165,35 +212,82 @@ class Resources:
         if not os.path.exists(self._userdata_base_path):
             os.makedirs(self._userdata_base_path)
 
-    def _get_or_generate_local_data(self):
-        # 载入 c_numuber.json 数据
-        with open(self.sehua_title_path, encoding="UTF-8") as data:
-            self.sehua_title_data = json.load(data)
-
-        # 载入 mapping_actor.xml mapping_info.xml 数据
-        actor_map_local_path = self.userdata_path("mapping_actor.xml")
-        info_map_local_path = self.userdata_path("mapping_info.xml")
-        if not os.path.exists(actor_map_local_path):
-            if not copy_file(self.actor_map_backup_path, actor_map_local_path):
-                actor_map_local_path = self.actor_map_backup_path
-        if not os.path.exists(info_map_local_path):
-            if not copy_file(self.info_map_backup_path, info_map_local_path):
-                info_map_local_path = self.info_map_backup_path
+    def _load_cached(self, source_path, name, build):
+        """
+        读取由 build(source_path) 生成的数据, 结果缓存于 userdata/cache/{name}.pickle
+        源文件的路径、大小或修改时间变化时(如用户编辑了映射表)重新生成
+        """
+        st = os.stat(source_path)
+        key = (CACHE_VERSION, os.path.abspath(source_path), st.st_size, st.st_mtime_ns)
+        cache_path = self.userdata_path(f"cache/{name}.pickle")
         try:
-            parser = etree.HTMLParser(encoding="utf-8")
-            with open(actor_map_local_path, encoding="utf-8") as f:
-                content = f.read()
-            self.actor_mapping_data = etree.HTML(content.encode("utf-8"), parser=parser)
-            with open(info_map_local_path, encoding="utf-8") as f:
-                content = f.read()
-            self.info_mapping_data = etree.HTML(content.encode("utf-8"), parser=parser)
+            with open(cache_path, "rb") as f:
+                cache_key, data = pickle.load(f)
+            if cache_key == key:
+                return data
+        except Exception:
+            pass
+        data = build(source_path)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path + ".tmp", "wb") as f:
+                pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_path + ".tmp", cache_path)
+        except Exception:
+            signal.show_traceback_log(traceback.format_exc())
+        return data
+
+    def _get_mapping_path(self, name, backup_path):
+        # 用户目录不存在映射表时, 复制内置映射表
+        local_path = self.userdata_path(name)
+        if not os.path.exists(local_path):
+            if not copy_file(backup_path, local_path):
+                local_path = backup_path
+        return local_path
+
+    def _load_mapping_index(self, name, backup_path):
+        path = self._get_mapping_path(name, backup_path)
+        try:
+            return self._load_cached(path, name, _parse_mapping)
         except Exception as e:
-            signal.show_log_text(
-                f" {actor_map_local_path} 读取失败！请检查该文件是否存在问题！如需重置请删除该文件！错误信息：\n{str(e)}"
-            )
+            signal.show_log_text(f" {path} 读取失败！请检查该文件是否存在问题！如需重置请删除该文件！错误信息：\n{str(e)}")
             signal.show_traceback_log(traceback.format_exc())
             signal.show_log_text(traceback.format_exc())
-            self.actor_mapping_data = {}
+            return {}, []
+
+    @cached_property
+    def actor_mapping_index(self):
+        """
+        演员映射表索引, 首次使用时加载, 见 _build_mapping_index
+        """
+        return self._load_mapping_index("mapping_actor.xml", self.actor_map_backup_path)
+
+    @cached_property
+    def info_mapping_index(self):
+        """
+        信息映射表索引, 首次使用时加载
+        """
+        return self._load_mapping_index("mapping_info.xml", self.info_map_backup_path)
+
+    @cached_property
+    def sehua_title_data(self):
+        """
+        色花数据 {番号: 标题}, 首次使用时加载
+        """
+        return self._load_cached(self.sehua_title_path, "c_number.json", _load_json)
+
+    def _load_zhconv_dict(self):
+        """
+        加载繁简转换字典
+        zhconv 在首次转换时才检查字典是否已加载, 无法延迟加载自定义字典, 因此启动时从缓存写入 zhconv 模块
+        """
+        path = self._resource_path("zhconv/zhcdict.json")
+        try:
+            zhcdicts = self._load_cached(path, "zhcdict.json", _load_zhconv_json)
+            importlib.import_module("zhconv.zhconv").zhcdicts = zhcdicts
+        except Exception:
+            signal.show_traceback_log(traceback.format_exc())
+            zhconv.loaddict(path)
 
     def _get_mark_icon(self):
         mark_folder = self.userdata_path("watermark")
@@ -216,3 +310,39 @@ class Resources:
 
 
 resources = Resources()
+
+
+def benchmark(times=5):
+    """
+    比较直接解析资源文件与读取缓存的耗时, 取多次运行的最小值
+        PYTHONPATH=./src python -m models.config.resources
+    """
+    actor_map_path = resources._get_mapping_path("mapping_actor.xml", resources.actor_map_backup_path)
+    info_map_path = resources._get_mapping_path("mapping_info.xml", resources.info_map_backup_path)
+    source_list = [
+        ("c_number.json", resources.sehua_title_path, _load_json),
+        ("mapping_actor.xml", actor_map_path, _parse_mapping),
+        ("mapping_info.xml", info_map_path, _parse_mapping),
+        ("zhcdict.json", resources._resource_path("zhconv/zhcdict.json"), _load_zhconv_json),
+    ]
+    total_source = total_cache = 0
+    for name, path, build in source_list:
+        source_time = cache_time = float("inf")
+        for _ in range(times):
+            start_time = time.perf_counter()
+            build(path)
+            source_time = min(source_time, time.perf_counter() - start_time)
+        resources._load_cached(path, name, build)  # 生成缓存
+        for _ in range(times):
+            start_time = time.perf_counter()
+            resources._load_cached(path, name, build)
+            cache_time = min(cache_time, time.perf_counter() - start_time)
+        total_source += source_time
+        total_cache += cache_time
+        print(f"{name:<20} 解析 {source_time * 1000:8.1f} ms    缓存 {cache_time * 1000:8.1f} ms")
+    print(f"{'合计':<18} 解析 {total_source * 1000:8.1f} ms    缓存 {total_cache * 1000:8.1f} ms")
+    print("其中色花数据及映射表为首次使用时加载, 不再占用启动时间")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -3,54 +3,45 @@
 """
 
 import json
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import langid
 
+from models.base.metadata_cache import MetadataCache
 from models.base.number import get_number_letters, is_uncensored
+from models.base.web import web
 from models.config.config import config
+from models.config.resources import resources
 from models.core.flags import Flags
-from models.crawlers import (
-    airav,
-    airav_cc,
-    avsex,
-    avsox,
-    cableav,
-    cnmdb,
-    dahlia,
-    dmm,
-    faleno,
-    fantastica,
-    fc2,
-    fc2club,
-    fc2hub,
-    freejavbt,
-    getchu,
-    getchu_dmm,
-    giga,
-    hdouban,
-    hscangku,
-    iqqtv_new,
-    jav321,
-    javbus,
-    javday,
-    javdb,
-    javlibrary_new,
-    kin8,
-    love6,
-    lulubar,
-    madouqu,
-    mdtv,
-    mgstage,
-    mmtv,
-    mywife,
-    official,
-    prestige,
-    theporndb,
-    xcity,
-)
+from models.core.site_stats import NOT_FOUND, site_stats
+from models.crawlers import get_crawler
 from models.entity.enums import FileMode
 
+metadata_cache = MetadataCache(resources.userdata_path("metadata_cache.db"))
+# 爬虫错误信息包含以下内容时, 视为网站没有此番号
+NOT_FOUND_KEYWORDS = [
+    "未匹配到番号",
+    "没有匹配的搜索结果",
+    "没有找到数据",
+    "未找到匹配的内容",
+    "搜索页未获取到匹配数据",
+    "不在官网番号前缀列表中",
+]
+MISS_INTERVAL = 86400  # 首次未找到后, 1 天内不再请求, 之后每次未找到间隔翻倍
+MISS_MAX_INTERVAL = 90 * 86400
+# 爬虫错误信息包含以下内容时, 归为对应的错误类型, 用于网站统计
+ERROR_TYPE_KEYWORDS = {
+    "拦截": ["Cookie", "禁止", "Cloudflare", "API Token"],
+    "网络": ["网络请求错误", "请求错误"],
+    "解析": ["数据生成出错", "数据获取失败"],
+}
+_fanout_pool = None
+_fanout_lock = threading.Lock()
+
 
 def _get_new_website_list(field_website_list, number_website_list, file_number, short_number, field, all=False):
     whole_fields = config.whole_fields  # 继续补全的字段
@@ -139,96 +130,110 @@ def _call_crawler(json_data, website, language, file_number, short_number, mosai
     if short_number and website != "mgstage" and website != "avsex":
         file_number = short_number
 
-    if website == "official":
-        json_data = json.loads(official.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "iqqtv":
-        json_data = json.loads(iqqtv_new.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "avsex":
-        json_data = json.loads(avsex.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "airav_cc":
-        json_data = json.loads(airav_cc.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "airav":
-        json_data = json.loads(airav.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "freejavbt":
-        json_data = json.loads(freejavbt.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "javbus":
-        json_data = json.loads(javbus.main(file_number, appoint_url, log_info, req_web, language, mosaic))
-    elif website == "javdb":
-        json_data = json.loads(javdb.main(file_number, appoint_url, log_info, req_web, language, org_language))
-    elif website == "jav321":
-        json_data = json.loads(jav321.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "dmm":
-        json_data = json.loads(dmm.main(file_number, appoint_url, log_info, req_web, language, file_path))
-    elif website == "javlibrary":
-        json_data = json.loads(javlibrary_new.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "xcity":
-        json_data = json.loads(xcity.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "avsox":
-        json_data = json.loads(avsox.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "mgstage":
-        json_data = json.loads(mgstage.main(file_number, appoint_url, log_info, req_web, language, short_number))
-    elif website == "7mmtv":
-        json_data = json.loads(mmtv.main(file_number, appoint_url, log_info, req_web, language, file_path))
-    elif website == "fc2":
-        json_data = json.loads(fc2.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "fc2hub":
-        json_data = json.loads(fc2hub.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "fc2club":
-        json_data = json.loads(fc2club.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "mdtv":
-        json_data = json.loads(
-            mdtv.main(file_number, appoint_url, log_info, req_web, language, file_path, appoint_number)
-        )
-    elif website == "madouqu":
-        json_data = json.loads(
-            madouqu.main(file_number, appoint_url, log_info, req_web, language, file_path, appoint_number)
-        )
-    elif website == "hscangku":
-        json_data = json.loads(
-            hscangku.main(file_number, appoint_url, log_info, req_web, language, file_path, appoint_number)
-        )
-    elif website == "cableav":
-        json_data = json.loads(
-            cableav.main(file_number, appoint_url, log_info, req_web, language, file_path, appoint_number)
-        )
-    elif website == "getchu":
-        json_data = json.loads(getchu.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "getchu_dmm":
-        json_data = json.loads(getchu_dmm.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "mywife":
-        json_data = json.loads(mywife.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "giga":
-        json_data = json.loads(giga.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "hdouban":
-        json_data = json.loads(
-            hdouban.main(file_number, appoint_url, log_info, req_web, language, file_path, appoint_number, mosaic)
-        )
-    elif website == "lulubar":
-        json_data = json.loads(lulubar.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "love6":
-        json_data = json.loads(love6.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "cnmdb":
-        json_data = json.loads(
-            cnmdb.main(file_number, appoint_url, log_info, req_web, language, file_path, appoint_number)
+    crawler = get_crawler(website) or get_crawler("javdb")
+    kwargs = {
+        "mosaic": mosaic,
+        "org_language": org_language,
+        "file_path": file_path,
+        "short_number": short_number,
+        "appoint_number": appoint_number,
+    }
+    args = [kwargs[each] for each in crawler.args] if crawler.name == website else []
+
+    # 指定网址时不使用缓存; 文件路径仅文件名会影响结果
+    if appoint_url or (config.metadata_cache != "on" and config.negative_cache != "on"):
+        web_data, _ = _run_crawler(crawler, file_number, appoint_url, log_info, req_web, language, args)
+        return web_data
+    extra = json.dumps(
+        [os.path.basename(value) if name == "file_path" else value for name, value in zip(crawler.args, args)],
+        ensure_ascii=False,
+    )
+    if config.metadata_cache == "on":
+        web_data, fetch_time = metadata_cache.get(
+            crawler.name, file_number, language, extra, ttl=config.metadata_cache_ttl * 86400
         )
-    elif website == "faleno":
-        json_data = json.loads(faleno.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "fantastica":
-        json_data = json.loads(fantastica.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "theporndb":
-        json_data = json.loads(theporndb.main(file_number, appoint_url, log_info, req_web, language, file_path))
-    elif website == "dahlia":
-        json_data = json.loads(dahlia.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "prestige":
-        json_data = json.loads(prestige.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "kin8":
-        json_data = json.loads(kin8.main(file_number, appoint_url, log_info, req_web, language))
-    elif website == "javday":
-        json_data = json.loads(javday.main(file_number, appoint_url, log_info, req_web, language))
-    else:
-        json_data = json.loads(javdb.main(file_number, appoint_url, log_info, req_web, language))
+        if web_data:
+            fetch_time = time.strftime("%Y-%m-%d %H:%M", time.localtime(fetch_time))
+            return _add_log(web_data, log_info + f"\n    💾 {website} 使用本地缓存数据（{fetch_time}）", req_web)
+    if config.negative_cache == "on":
+        next_time = metadata_cache.get_miss(crawler.name, file_number, extra)
+        if next_time > time.time():
+            next_time = time.strftime("%Y-%m-%d", time.localtime(next_time))
+            error_info = f"此前未找到此番号，{next_time} 前不再请求"
+            dic = {
+                "title": "",
+                "cover": "",
+                "website": "",
+                "log_info": f"\n    ⏭ {website} {error_info}",
+                "error_info": error_info,
+                "req_web": "",
+            }
+            return _add_log({crawler.name: {"zh_cn": dic, "zh_tw": dic.copy(), "jp": dic.copy()}}, log_info, req_web)
+
+    # 日志从空白开始, 缓存的数据不包含本次刮削的日志
+    web_data, web_json = _run_crawler(crawler, file_number, appoint_url, "", "", language, args)
+    if web_json.get("title"):
+        if config.metadata_cache == "on":
+            metadata_cache.set(crawler.name, file_number, language, extra, web_data)
+        if config.negative_cache == "on":
+            metadata_cache.remove_miss(crawler.name, file_number, extra)
+    elif config.negative_cache == "on" and _is_not_found(web_json.get("error_info", "")):
+        metadata_cache.add_miss(crawler.name, file_number, extra, MISS_INTERVAL, MISS_MAX_INTERVAL)
+    return _add_log(web_data, log_info, req_web)
+
+
+def _run_crawler(crawler, file_number, appoint_url, log_info, req_web, language, args):
+    """
+    请求网站, 记录结果及用时, 返回 (爬虫数据, 指定语言的数据)
+    """
+    start_time = time.time()
+    wait_time = web.get_wait_time()
+    web_data = _split_languages(crawler.get_main()(file_number, appoint_url, log_info, req_web, language, *args))
+    web_json = web_data.get(crawler.name, {}).get(language, {})
+    success = bool(web_json.get("title"))
+    error_type = "" if success else _get_error_type(web_json.get("error_info", ""))
+    used_time = time.time() - start_time - (web.get_wait_time() - wait_time)  # 扣除熔断及限速的等待
+    site_stats.record(crawler.name, get_number_letters(file_number), success, used_time, error_type)
+    return web_data, web_json
+
+
+def _get_error_type(error_info):
+    if _is_not_found(error_info):
+        return NOT_FOUND
+    for error_type, keywords in ERROR_TYPE_KEYWORDS.items():
+        if any(each in error_info for each in keywords):
+            return error_type
+    return "其他"
+
+
+def _is_not_found(error_info):
+    """
+    根据爬虫的错误信息判断网站是否确实没有此番号, 网络错误等情况不计入
+    """
+    return any(each in error_info for each in NOT_FOUND_KEYWORDS)
+
+
+def _add_log(web_data, log_info, req_web):
+    """
+    将刮削前的日志拼接到爬虫数据的日志前面, 与直接传入日志调用爬虫的结果一致
+    """
+    for language_dic in web_data.values():
+        for each_json in language_dic.values():
+            each_json["req_web"] = req_web + each_json.get("req_web", "")
+            each_json["log_info"] = log_info + each_json.get("log_info", "")
+    return web_data
 
-    return json_data
+
+def _split_languages(web_data):
+    """
+    爬虫返回的各语言数据通常是同一个字典, 复制为互相独立的字典, 避免修改一种语言的数据时影响其他语言
+    """
+    for website, language_dic in web_data.items():
+        web_data[website] = {
+            language: {k: v.copy() if isinstance(v, (list, dict)) else v for k, v in data.items()}
+            for language, data in language_dic.items()
+        }
+    return web_data
 
 
 def _decide_websites(json_data, number_website_list):
@@ -350,24 +355,31 @@ def _decide_websites(json_data, number_website_list):
         if not wanted_website_new_list:
             request_field_list.pop()
 
-    for each_f in request_field_list:
-        field_name, field_cnname, field_language, website_list = each_f
-        if field_name in none_fields:
-            continue
-        _call_crawlers(
-            all_json_data,
-            json_data,
-            website_list,
-            field_name,
-            field_cnname,
-            field_language,
-            config,
-            file_number,
-            short_number,
-            json_data["mosaic"],
-        )
-        if field_name == "title" and not json_data["title"]:
-            return json_data
+    pending = {}  # 并发请求中的网站 {(网站, 语言): Future}
+    try:
+        for each_f in request_field_list:
+            field_name, field_cnname, field_language, website_list = each_f
+            if field_name in none_fields:
+                continue
+            _call_crawlers(
+                all_json_data,
+                json_data,
+                website_list,
+                field_name,
+                field_cnname,
+                field_language,
+                config,
+                file_number,
+                short_number,
+                json_data["mosaic"],
+                pending,
+            )
+            if field_name == "title" and not json_data["title"]:
+                return json_data
+    finally:
+        # 已取得结果，取消尚未开始的请求，已开始的请求完成后丢弃（开启网络缓存时可被后续复用）
+        for future in pending.values():
+            future.cancel()
 
     # 处理字段字段：从已请求的网站中，按字段网站优先级取值
     title_website_list = title_jp_website_list
@@ -606,6 +618,19 @@ def _deal_each_field(all_json_data, json_data, website_list, field_name, field_c
             json_data["fields_info"] += "\n     " + f"{field_name:<13}" + f': {"-----"} ({"not found"})'
 
 
+def _get_fanout_pool():
+    """
+    获取并发请求网站使用的线程池，线程数量为 刮削线程数 * 并发网站数
+    """
+    global _fanout_pool
+    size = max(config.thread_number * config.crawler_fanout, 1)
+    with _fanout_lock:
+        if _fanout_pool is None or _fanout_pool._max_workers != size:
+            # 不关闭旧线程池: 正在执行的 _call_crawlers 可能仍在提交任务, 不再被引用后空闲线程随之退出
+            _fanout_pool = ThreadPoolExecutor(size, "MDCx-Crawler")
+        return _fanout_pool
+
+
 def _call_crawlers(
     all_json_data,
     json_data,
@@ -617,6 +642,7 @@ def _call_crawlers(
     file_number,
     short_number,
     mosaic,
+    pending,
 ):  # 4
     """
     按照设置的网站顺序获取各个字段信息
@@ -625,7 +651,20 @@ def _call_crawlers(
         if field_name not in ["title", "title_zh", "outline_zh", "wanted", "score"]:
             website_list.insert(0, "official")
 
-    backup_jsondata = {}
+    # 自适应网站顺序: 在设置的网站范围内, 后移近期成功率低或用时过长的网站, 跳过连续出错的网站
+    # 一次刮削包含搜索、详情等多个请求及重试, 用时上限按 超时时间 * 重试次数 计算
+    if config.website_adaptive == "on":
+        new_website_list, skip_list = site_stats.order(
+            website_list, get_number_letters(file_number), config.timeout * config.retry
+        )
+        if new_website_list != website_list:
+            json_data["log_info"] += f"\n    🔀 {field_cnname} 网站顺序: {' > '.join(new_website_list)}"
+            if skip_list:
+                json_data["log_info"] += f"（连续出错，暂时跳过: {', '.join(skip_list)}）"
+        website_list = new_website_list
+
+    # 按顺序生成 (网站, 语言, 字段) 列表
+    request_list = []
     for website in website_list:
         if (website in ["avsox", "mdtv"] and mosaic in ["有码", "无码破解", "流出", "里番", "动漫"]) or (
             website == "mdtv" and mosaic == "无码"
@@ -641,13 +680,41 @@ def _call_crawlers(
             title_language = "jp"
         else:
             title_language = getattr(config, field_language)
+        request_list.append((website, title_language, field_name))
+
+    backup_jsondata = {}
+    fanout = config.crawler_fanout
+    for i, (website, title_language, field_name) in enumerate(request_list):
+        # 并发模式：同时请求当前及之后的 fanout 个网站，仍按优先级顺序使用结果
+        if fanout > 1:
+            for each_website, each_language, _ in request_list[i : i + fanout]:
+                if (each_website, each_language) in pending:
+                    continue
+                if each_language in all_json_data.get(each_website, {}):
+                    continue
+                # 日志从空白开始，使用结果时再拼接到当前日志后面
+                pending[(each_website, each_language)] = _get_fanout_pool().submit(
+                    _call_crawler,
+                    dict(json_data, log_info="", req_web=""),
+                    each_website,
+                    each_language,
+                    file_number,
+                    short_number,
+                    mosaic,
+                    config.title_language,
+                )
 
         try:
             web_data_json = all_json_data[website][title_language]
         except:
-            web_data = _call_crawler(
-                json_data, website, title_language, file_number, short_number, mosaic, config.title_language
-            )
+            future = pending.pop((website, title_language), None)
+            if future:
+                # 拼接日志，与顺序请求时的结果一致
+                web_data = _add_log(future.result(), json_data["log_info"], json_data["req_web"])
+            else:
+                web_data = _call_crawler(
+                    json_data, website, title_language, file_number, short_number, mosaic, config.title_language
+                )
             all_json_data.update(web_data)
             web_data_json = all_json_data.get(website).get(title_language)
             json_data["req_web"] = web_data_json["req_web"]
@@ -713,24 +780,20 @@ def _call_specific_crawler(json_data, website):
     studio_language = config.studio_language
     publisher_language = config.publisher_language
     director_language = config.director_language
-    if website not in ["airav_cc", "iqqtv", "airav", "avsex", "javlibrary", "mdtv", "madouqu", "lulubar"]:
-        title_language = "jp"
-        outline_language = "jp"
-        actor_language = "jp"
-        tag_language = "jp"
-        series_language = "jp"
-        studio_language = "jp"
-        publisher_language = "jp"
-        director_language = "jp"
-    elif website == "mdtv":
-        title_language = "zh_cn"
-        outline_language = "zh_cn"
-        actor_language = "zh_cn"
-        tag_language = "zh_cn"
-        series_language = "zh_cn"
-        studio_language = "zh_cn"
-        publisher_language = "zh_cn"
-        director_language = "zh_cn"
+    # 网站不提供设置的语言时, 使用网站的默认语言
+    crawler = get_crawler(website)
+    if crawler:
+        title_language = crawler.get_language(title_language)
+        outline_language = crawler.get_language(outline_language)
+        actor_language = crawler.get_language(actor_language)
+        tag_language = crawler.get_language(tag_language)
+        series_language = crawler.get_language(series_language)
+        studio_language = crawler.get_language(studio_language)
+        publisher_language = crawler.get_language(publisher_language)
+        director_language = crawler.get_language(director_language)
+    else:
+        title_language = outline_language = actor_language = tag_language = "jp"
+        series_language = studio_language = publisher_language = director_language = "jp"
     web_data = _call_crawler(json_data, website, title_language, file_number, short_number, mosaic, org_language)
     web_data_json = web_data.get(website).get(title_language)
     json_data.update(web_data_json)
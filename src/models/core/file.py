@@ -5,10 +5,12 @@
 import os
 import re
 import shutil
+import threading
 import time
 import traceback
 
 from models.base.file import copy_file, delete_file, move_file, read_link, split_path
+from models.base.file_index import FileIndex
 from models.base.number import (
     deal_actor_more,
     get_file_number,
@@ -27,6 +29,9 @@ from models.core.utils import get_movie_path_setting, get_new_release, nfd2c
 from models.entity.enums import FileMode
 from models.signals import signal
 
+file_index = FileIndex(resources.userdata_path("file_index.db"))
+_success_lock = threading.Lock()
+
 
 def _need_clean(file_path, file_name, file_ext):
     # 判断文件是否需清理
@@ -1086,108 +1091,100 @@ def newtdisk_creat_symlink(copy_flag, netdisk_path="", local_path=""):
         signal.reset_buttons_status.emit()
 
 
+def _on_index_file(path, f):
+    """
+    重新读取文件夹时处理单个文件, 返回是否记录到索引
+    """
+    file_name, file_type_current = os.path.splitext(f)
+
+    # 跳过隐藏文件、预告片、主题视频
+    if re.search(r"^\..+", file_name):
+        return False
+    if "trailer." in f or "trailers." in f:
+        return False
+    if "theme_video." in f:
+        return False
+
+    # 判断清理文件
+    if _need_clean(path, f, file_type_current):
+        result, error_info = delete_file(path)
+        if result:
+            signal.show_log_text(" 🗑 Clean: %s " % path)
+        else:
+            signal.show_log_text(" 🗑 Clean error: %s " % error_info)
+        return False
+    return True
+
+
 def movie_lists(escape_folder_list, movie_type, movie_path):
     start_time = time.time()
     total = []
-    file_type = movie_type.split("|")
+    file_type = [each.lower() for each in movie_type.split("|") if each]
     skip_list = ["skip", ".skip", ".ignore"]
     not_skip_success = bool("skip_success_file" not in config.no_escape)
-    i = 100
     skip = 0
-    skip_repeat_softlink = 0
     signal.show_traceback_log("🔎 遍历待刮削目录....")
-    for root, dirs, files in os.walk(movie_path):
+
+    def _exclude(root):
         # 文件夹是否在排除目录
-        root = os.path.join(root, "").replace("\\", "/")
-        if "behind the scenes" in root or root in escape_folder_list:
-            dirs[:] = []  # 忽略当前文件夹子目录
-            continue
+        return "behind the scenes" in root or root in escape_folder_list
+
+    def _progress(count):
+        signal.show_log_text(
+            f"    {get_current_time()} Scanned changed folders ({count})! "
+            f"({get_used_time(start_time)}s)... Still searching, please wait... \u3000"
+        )
+
+    # 清理规则变化后, 索引中已记录的文件可能需要清理, 需重新读取全部文件夹
+    signature = repr(
+        [
+            config.can_clean,
+            config.clean_ext_list,
+            config.clean_name_list,
+            config.clean_contains_list,
+            config.clean_size_list,
+            config.clean_ignore_ext_list,
+            config.clean_ignore_contains_list,
+        ]
+    )
+    file_list = file_index.walk(
+        movie_path,
+        file_type,
+        _exclude,
+        _on_index_file,
+        skip_names=skip_list,
+        signature=signature,
+        full=config.file_index != "on",
+        progress=_progress,
+    )
 
-        # 文件夹是否存在跳过文件
-        for skip_key in skip_list:
-            if skip_key in files:
-                dirs[:] = []
-                break
+    for path, is_link in file_list:
+        # 清理失效的软链接文件
+        if is_link and "check_symlink" in config.no_escape and not os.path.exists(read_link(path)):
+            result, error_info = delete_file(path)
+            if result:
+                signal.show_log_text(" 🗑 Clean dead link: %s " % path)
+            else:
+                signal.show_log_text(" 🗑 Clean dead link error: %s " % error_info)
+            continue
+        # mac 转换成 NFC，因为mac平台nfc和nfd指向同一个文件，windows平台指向不同文件
+        if not config.is_windows:
+            path = nfd2c(path)
+        new_path = convert_path(path)
+        if not_skip_success or new_path not in Flags.success_list:
+            total.append(new_path)
         else:
-            # 处理文件列表
-            for f in files:
-                file_name, file_type_current = os.path.splitext(f)
-
-                # 跳过隐藏文件、预告片、主题视频
-                if re.search(r"^\..+", file_name):
-                    continue
-                if "trailer." in f or "trailers." in f:
-                    continue
-                if "theme_video." in f:
-                    continue
-
-                # 判断清理文件
-                path = os.path.join(root, f)
-                if _need_clean(path, f, file_type_current):
-                    result, error_info = delete_file(path)
-                    if result:
-                        signal.show_log_text(" 🗑 Clean: %s " % path)
-                    else:
-                        signal.show_log_text(" 🗑 Clean error: %s " % error_info)
-                    continue
-
-                # 添加文件
-                temp_total = []
-                if file_type_current.lower() in file_type:
-                    if os.path.islink(path):
-                        real_path = read_link(path)
-                        # 清理失效的软链接文件
-                        if "check_symlink" in config.no_escape and not os.path.exists(real_path):
-                            result, error_info = delete_file(path)
-                            if result:
-                                signal.show_log_text(" 🗑 Clean dead link: %s " % path)
-                            else:
-                                signal.show_log_text(" 🗑 Clean dead link error: %s " % error_info)
-                            continue
-                        if real_path in temp_total:
-                            skip_repeat_softlink += 1
-                            delete_file(path)
-                            continue
-                        else:
-                            temp_total.append(real_path)
-
-                    if path in temp_total:
-                        skip_repeat_softlink += 1
-                        continue
-                    else:
-                        temp_total.append(path)
-                    # mac 转换成 NFC，因为mac平台nfc和nfd指向同一个文件，windows平台指向不同文件
-                    if not config.is_windows:
-                        path = nfd2c(path)
-                    new_path = convert_path(path)
-                    if not_skip_success or new_path not in Flags.success_list:
-                        total.append(new_path)
-                    else:
-                        skip += 1
-
-        found_count = len(total)
-        if found_count >= i:
-            i = found_count + 100
-            signal.show_traceback_log(
-                f"✅ Found ({found_count})! "
-                f"Skip successfully scraped ({skip}) repeat softlink ({skip_repeat_softlink})! "
-                f"({get_used_time(start_time)}s)... Still searching, please wait... \u3000"
-            )
-            signal.show_log_text(
-                f"    {get_current_time()} Found ({found_count})! "
-                f"Skip successfully scraped ({skip}) repeat softlink ({skip_repeat_softlink})! "
-                f"({get_used_time(start_time)}s)... Still searching, please wait... \u3000"
-            )
+            skip += 1
 
     total.sort()
     signal.show_traceback_log(
         f"🎉 Done!!! Found ({len(total)})! "
-        f"Skip successfully scraped ({skip}) repeat softlink ({skip_repeat_softlink})! "
+        f"Skip successfully scraped ({skip}) rescan folders ({file_index.rescan_count})! "
         f"({get_used_time(start_time)}s) \u3000"
     )
     signal.show_log_text(
         f"    Done!!! Found ({len(total)})! "
-        f"Skip successfully scraped ({skip}) repeat softlink ({skip_repeat_softlink})! "
+        f"Skip successfully scraped ({skip}) rescan folders ({file_index.rescan_count})! "
         f"({get_used_time(start_time)}s) \u3000"
     )
     return total
@@ -1566,6 +1563,43 @@ def get_file_info(file_path, copy_sub=True):
     return json_data, movie_number, folder_path, file_name, file_ex, sub_list, file_show_name, file_show_path
 
 
+def is_new_movie_file(path, movie_path, escape_folder_list, movie_type):
+    """
+    判断监控目录时发现的新文件是否需要刮削, 规则与 movie_lists 一致
+    """
+    path = path.replace("\\", "/")
+    folder, f = os.path.split(path)
+    file_name, file_type_current = os.path.splitext(f)
+
+    # 跳过非视频文件、隐藏文件、预告片、主题视频
+    if file_type_current.lower() not in movie_type.split("|"):
+        return False
+    if re.search(r"^\..+", file_name):
+        return False
+    if "trailer." in f or "trailers." in f or "theme_video." in f:
+        return False
+
+    # 各级文件夹是否在排除目录或存在跳过文件
+    movie_path = os.path.join(movie_path, "").replace("\\", "/")
+    root = os.path.join(folder, "").replace("\\", "/")
+    if not root.startswith(movie_path):
+        return False
+    while True:
+        if "behind the scenes" in root or root in escape_folder_list:
+            return False
+        for skip_key in ["skip", ".skip", ".ignore"]:
+            if os.path.exists(os.path.join(root, skip_key)):
+                return False
+        if len(root) <= len(movie_path):
+            break
+        root = os.path.join(os.path.dirname(root.rstrip("/")), "").replace("\\", "/")
+
+    if not config.is_windows:
+        path = nfd2c(path)
+    new_path = convert_path(path)
+    return "skip_success_file" not in config.no_escape or new_path not in Flags.success_list
+
+
 def get_movie_list(file_mode: FileMode, movie_path, escape_folder_list):
     movie_list = []
     if file_mode == FileMode.Default:  # 刮削默认视频目录的文件
@@ -1647,14 +1681,23 @@ def _clean_empty_fodlers(path, file_mode):
 
 
 def get_success_list():
-    Flags.success_save_time = time.time()
+    """
+    读取成功列表, success.txt 每行一个路径, 刮削成功时追加写入
+    文件中存在重复路径时(如多次刮削同一文件), 重写文件以压缩
+    """
+    Flags.success_list = set()
+    Flags.success_line_count = 0
     if os.path.isfile(resources.userdata_path("success.txt")):
+        line = "\n"
         with open(resources.userdata_path("success.txt"), encoding="utf-8", errors="ignore") as f:
-            temp = f.read()
-            Flags.success_list = set(temp.split("\n")) if temp.strip() else set()
-            if "" in Flags.success_list:
-                Flags.success_list.remove("")
-            save_success_list()
+            for line in f:
+                path = line.rstrip("\r\n")
+                if path:
+                    Flags.success_list.add(path)
+                    Flags.success_line_count += 1
+        if not line.endswith("\n"):  # 旧版本保存的文件末尾没有换行, 需重写后才能追加
+            Flags.success_line_count = -1
+        save_success_list()
     signal.view_success_file_settext.emit(f"查看 ({len(Flags.success_list)})")
 
 
@@ -2078,26 +2121,51 @@ def _deal_path_name(path):
     return path
 
 
+def _write_success_list():
+    """
+    重写 success.txt, 先写入临时文件再替换, 避免中途退出导致文件损坏
+    """
+    path = resources.userdata_path("success.txt")
+    temp_path = path + ".tmp"
+    temp = sorted(Flags.success_list)
+    with open(temp_path, "w", encoding="utf-8", errors="ignore") as f:
+        f.write("".join(each + "\n" for each in temp))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    Flags.success_line_count = len(temp)
+
+
 def save_success_list(old_path="", new_path=""):
-    if old_path and config.record_success_file:
-        # 软硬链接时，保存原路径；否则保存新路径
-        if config.soft_link != 0:
-            Flags.success_list.add(convert_path(old_path))
-        else:
-            Flags.success_list.add(convert_path(new_path))
-            if os.path.islink(new_path):
-                Flags.success_list.add(convert_path(old_path))
-                Flags.success_list.add(convert_path(read_link(new_path)))
-    if get_used_time(Flags.success_save_time) > 5 or not old_path:
-        Flags.success_save_time = time.time()
+    """
+    记录成功刮削的文件, 新路径追加写入 success.txt
+    不传参数时, 若成功列表被清空或修改过, 重写整个文件
+    """
+    with _success_lock:
         try:
-            with open(resources.userdata_path("success.txt"), "w", encoding="utf-8", errors="ignore") as f:
-                temp = list(Flags.success_list)
-                temp.sort()
-                f.write("\n".join(temp))
+            if old_path and config.record_success_file:
+                # 软硬链接时，保存原路径；否则保存新路径
+                if config.soft_link != 0:
+                    path_list = [convert_path(old_path)]
+                else:
+                    path_list = [convert_path(new_path)]
+                    if os.path.islink(new_path):
+                        path_list.append(convert_path(old_path))
+                        path_list.append(convert_path(read_link(new_path)))
+                path_list = [each for each in dict.fromkeys(path_list) if each not in Flags.success_list]
+                if not path_list:
+                    return
+                with open(resources.userdata_path("success.txt"), "a", encoding="utf-8", errors="ignore") as f:
+                    f.write("".join(each + "\n" for each in path_list))
+                Flags.success_list.update(path_list)
+                Flags.success_line_count += len(path_list)
+            elif not old_path and Flags.success_line_count != len(Flags.success_list):
+                _write_success_list()
+            else:
+                return
         except Exception as e:
             signal.show_log_text(f"  Save success list Error {str(e)}\n {traceback.format_exc()}")
-        signal.view_success_file_settext.emit(f"查看 ({len(Flags.success_list)})")
+    signal.view_success_file_settext.emit(f"查看 ({len(Flags.success_list)})")
 
 
 def save_remain_list():
@@ -13,9 +13,9 @@ class Flags:
     appoint_url = None
     total_kills = 0
     now_kill = 0
-    success_save_time = None
+    success_line_count = 0  # success.txt 中的行数, 与成功列表数量不一致时需要重写文件
     pool = None
-    next_start_time = None
+    pipeline = None  # 刮削各阶段的并发控制
     lock = None
     count_claw = 0  # 批量刮削次数
     can_save_remain = False  # 保存剩余任务
@@ -30,6 +30,7 @@ class Flags:
     rest_sleepping = False  # 是否休眠中
     scrape_starting = 0  # 已进入过刮削流程的数量
     scrape_started = 0  # 已进入过刮削流程并开始的数量
+    scrape_waiting = 0  # 等待相同番号刮削完成的任务数量
     scrape_done = 0  # 已完成刮削数量
     succ_count = 0  # 成功数量
     fail_count = 0  # 失败数量
@@ -41,8 +42,7 @@ class Flags:
     trailer_deal_set = set()  # 当前文件trailer已处理的标识（如已存在，视为剧照已处理过）
     theme_videos_deal_set = set()  # 当前文件夹剧照已下载的标识（如已存在，视为剧照已处理过）
     nfo_deal_set = set()  # 当前文件nfo已处理的标识（如已存在，视为剧照已处理过）
-    json_get_set = set()  # 去获取json的番号列表
-    json_data_dic = {}  # 获取成功的json
+    json_future_dic = {}  # 番号刮削结果 {番号: Future}, 首个刮削该番号的任务完成后设置结果, 失败时结果为 None
     img_path = ""
     deepl_result = {}  # deep 翻译结果（当没有填写api时，使用第三方翻译模块，作用是实现超时自动退出，避免卡死）
     failed_list = []  # 失败文件和错误原因记录
@@ -73,6 +73,7 @@ class Flags:
         cls.rest_sleepping = False
         cls.scrape_starting = 0
         cls.scrape_started = 0
+        cls.scrape_waiting = 0
         cls.scrape_done = 0
         cls.succ_count = 0
         cls.fail_count = 0
@@ -84,8 +85,7 @@ class Flags:
         cls.trailer_deal_set = set()
         cls.theme_videos_deal_set = set()
         cls.nfo_deal_set = set()
-        cls.json_get_set = set()
-        cls.json_data_dic = {}
+        cls.json_future_dic = {}
         cls.img_path = ""
         cls.deepl_result = {}
         cls.stop_flag = False
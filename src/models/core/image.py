@@ -10,6 +10,7 @@ import traceback
 from PIL import Image
 
 from models.base.file import check_pic, move_file, split_path
+from models.base.image_pool import image_pool
 from models.base.utils import convert_path, get_used_time
 from models.config.config import config
 from models.config.resources import resources
@@ -92,7 +93,10 @@ def extrafanart_extras_copy(json_data, folder_new_path):
     return True
 
 
-def _add_to_pic(pic_path, img_pic, mark_size, count, mark_name):
+def _add_to_pic(img_pic, ops, mark_size, count, mark_name):
+    """
+    计算水印位置, 将添加水印的操作加入 ops, 由图片进程池统一添加
+    """
     # 获取水印图片，生成水印
     mark_fixed = config.mark_fixed
     mark_pos_corner = config.mark_pos_corner
@@ -114,16 +118,14 @@ def _add_to_pic(pic_path, img_pic, mark_size, count, mark_name):
 
     if mark_pic_path:
         try:
-            img_subt = Image.open(mark_pic_path)
-            img_subt = img_subt.convert("RGBA")
             scroll_high = int(img_pic.height * mark_size / 40)
-            scroll_width = int(scroll_high * img_subt.width / img_subt.height)
-            img_subt = img_subt.resize((scroll_width, scroll_high), Image.LANCZOS)
+            mtime = os.path.getmtime(mark_pic_path)
+            with Image.open(mark_pic_path) as icon:  # 仅读取文件头获取尺寸, 缩放由子进程完成
+                scroll_width = int(scroll_high * icon.width / icon.height)  # 与 load_icon 的计算方式一致
         except:
             signal.show_log_text(f"{traceback.format_exc()}\n Open Pic: {mark_pic_path}")
             print(traceback.format_exc())
             return
-        r, g, b, a = img_subt.split()  # 获取颜色通道, 保持png的透明性
 
         # 固定一个位置
         if mark_fixed == "corner":
@@ -160,20 +162,7 @@ def _add_to_pic(pic_path, img_pic, mark_size, count, mark_name):
                 {"x": 0, "y": img_pic.height - scroll_high},
             ]
             mark_postion = (pos[count]["x"], pos[count]["y"])
-        try:  # 图片如果下载不完整时，这里会崩溃，跳过
-            img_pic.paste(img_subt, mark_postion, mask=a)
-        except:
-            signal.show_log_text(traceback.format_exc())
-        img_pic = img_pic.convert("RGB")
-        temp_pic_path = pic_path + ".[MARK].jpg"
-        try:
-            img_pic.load()
-            img_pic.save(temp_pic_path, quality=95, subsampling=0)
-        except:
-            signal.show_log_text(traceback.format_exc())
-        img_subt.close()
-        if check_pic(temp_pic_path):
-            move_file(temp_pic_path, pic_path)
+        ops.append(("paste_icon", mark_pic_path, mtime, scroll_high, mark_postion))
 
 
 def add_mark_thread(pic_path, mark_list):
@@ -185,17 +174,19 @@ def add_mark_thread(pic_path, mark_list):
     mark_pos_mosaic = config.mark_pos_mosaic
     mark_pos_corner = config.mark_pos_corner
     try:
-        img_pic = Image.open(pic_path)
+        img_pic = Image.open(pic_path)  # 仅读取文件头, 获取图片尺寸
+        img_pic.close()
     except:
         signal.show_log_text(f"{traceback.format_exc()}\n Open Pic: {pic_path}")
         return
 
+    ops = []
     if mark_fixed == "corner":
         count = 0
         if "left" not in mark_pos_corner:
             count = 3 - len(mark_list)
         for mark_name in mark_list:
-            _add_to_pic(pic_path, img_pic, mark_size, count, mark_name)
+            _add_to_pic(img_pic, ops, mark_size, count, mark_name)
             count += 1
     else:
         pos = {
@@ -209,22 +200,33 @@ def add_mark_thread(pic_path, mark_list):
         for mark_name in mark_list:
             if mark_name == "4K" or mark_name == "8K":  # 4K/8K使用固定位置
                 count_hd = pos.get(mark_pos_hd)
-                _add_to_pic(pic_path, img_pic, mark_size, count_hd, mark_name)
+                _add_to_pic(img_pic, ops, mark_size, count_hd, mark_name)
             elif mark_fixed == "on":  # 固定位置
                 if mark_name == "字幕":
                     count = pos.get(mark_pos_sub)
                 else:
                     count = pos.get(mark_pos_mosaic)
-                _add_to_pic(pic_path, img_pic, mark_size, count, mark_name)
+                _add_to_pic(img_pic, ops, mark_size, count, mark_name)
             else:  # 不固定位置
                 if mark_pos_count % 4 == count_hd:
                     mark_pos_count += 1
                 if mark_name == "字幕":
-                    _add_to_pic(pic_path, img_pic, mark_size, mark_pos_count % 4, mark_name)  # 添加字幕
+                    _add_to_pic(img_pic, ops, mark_size, mark_pos_count % 4, mark_name)  # 添加字幕
                     mark_pos_count += 1
                 else:
-                    _add_to_pic(pic_path, img_pic, mark_size, mark_pos_count % 4, mark_name)
-    img_pic.close()
+                    _add_to_pic(img_pic, ops, mark_size, mark_pos_count % 4, mark_name)
+
+    if not ops:
+        return
+
+    # 所有水印一次添加完成后只编码一次
+    temp_pic_path = pic_path + ".[MARK].jpg"
+    try:  # 图片如果下载不完整时，这里会崩溃，跳过
+        image_pool.run(pic_path, temp_pic_path, ops)
+    except:
+        signal.show_log_text(traceback.format_exc())
+    if check_pic(temp_pic_path):
+        move_file(temp_pic_path, pic_path)
 
 
 def add_mark(json_data, poster_marked=False, thumb_marked=False, fanart_marked=False):
@@ -0,0 +1,97 @@
+"""
+刮削流水线的阶段控制
+单个文件的刮削分为 网络刮削 -> 图片下载 -> 图片处理 -> 文件写入 几个阶段, 每个阶段单独限制并发数量,
+避免网络、CPU、磁盘任务争抢同一批线程; 同时刮削的文件数量(即各阶段之间的缓冲)由刮削线程数量限制
+"""
+
+import os
+import threading
+import time
+
+
+class Stage:
+    def __init__(self, name, limit):
+        self.name = name
+        self.limit = max(int(limit), 1)
+        self.semaphore = threading.BoundedSemaphore(self.limit)
+        self.lock = threading.Lock()
+        self.waiting = 0  # 排队数量
+        self.running = 0  # 执行中数量
+        self.done = 0  # 已完成数量
+        self.busy_time = 0.0  # 累计执行时间
+        self.start_time = time.time()
+        self._local = threading.local()
+
+    def __enter__(self):
+        with self.lock:
+            self.waiting += 1
+        self.semaphore.acquire()
+        with self.lock:
+            self.waiting -= 1
+            self.running += 1
+        self._local.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        used_time = time.time() - self._local.start
+        with self.lock:
+            self.running -= 1
+            self.done += 1
+            self.busy_time += used_time
+        self.semaphore.release()
+        return False
+
+    def get_info(self):
+        """
+        返回阶段状态: 排队数量、执行中数量、完成数量、吞吐量(个/分钟)、平均用时
+        """
+        with self.lock:
+            elapsed = max(time.time() - self.start_time, 1)
+            average = self.busy_time / self.done if self.done else 0
+            return (
+                f"{self.name:<10} 排队: {self.waiting:<4} 执行: {self.running}/{self.limit:<4} "
+                f"完成: {self.done:<6} 吞吐: {self.done * 60 / elapsed:.1f}/分钟  平均用时: {average:.2f}S"
+            )
+
+
+class ScrapePipeline:
+    def __init__(self, limit_dic):
+        self.limit_dic = limit_dic
+        self.crawl = Stage("crawl", limit_dic.get("crawl", 8))  # 网络刮削及翻译
+        self.download = Stage("download", limit_dic.get("download", 16))  # 图片、预告片下载
+        self.image = Stage("image", limit_dic.get("image", 2))  # 图片裁剪、水印等 CPU 任务
+        self.disks = {}  # 文件移动、nfo 写入等磁盘任务, 按目标磁盘分别限制 {设备号: Stage}
+        self.lock = threading.Lock()
+
+    def disk(self, path):
+        """
+        获取目标路径所在磁盘的阶段
+        """
+        volume = _get_volume(path)
+        with self.lock:
+            stage = self.disks.get(volume)
+            if not stage:
+                stage = Stage(f"disk-{len(self.disks) + 1}", self.limit_dic.get("disk", 2))
+                self.disks[volume] = stage
+            return stage
+
+    def get_info(self):
+        stages = [self.crawl, self.download, self.image]
+        with self.lock:
+            stages += list(self.disks.values())
+        return "\n".join(f" 📊 {stage.get_info()}" for stage in stages)
+
+
+def _get_volume(path):
+    """
+    获取路径所在磁盘的设备号, 路径不存在时向上查找已存在的目录
+    """
+    path = os.path.abspath(path)
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return os.path.splitdrive(path)[0]
+            path = parent
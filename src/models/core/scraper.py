@@ -3,10 +3,10 @@ import re
 import threading
 import time
 import traceback
-
-from PyQt5.QtWidgets import QMessageBox
+from concurrent.futures import Future, wait
 
 from models.base.file import copy_file, move_file, read_link, split_path
+from models.base.image_pool import image_pool
 from models.base.path import get_main_path
 from models.base.pool import Pool
 from models.base.utils import convert_path, get_current_time, get_real_time, get_used_time
@@ -34,6 +34,8 @@ from models.core.file import (
 from models.core.flags import Flags
 from models.core.image import add_mark, extrafanart_copy2, extrafanart_extras_copy
 from models.core.nfo import get_nfo_data, write_nfo
+from models.core.pipeline import ScrapePipeline
+from models.core.site_stats import site_stats
 from models.core.translate import translate_actor, translate_info, translate_title_outline
 from models.core.utils import (
     deal_some_field,
@@ -51,8 +53,8 @@ from models.tools.emby_actor_image import update_emby_actor_photo
 from models.tools.emby_actor_info import creat_kodi_actors
 
 
-def _scrape_one_file(file_path, file_info, file_mode):
-    # 处理单个文件刮削
+def _scrape_one_file(file_path, file_info, file_mode, claim):
+    # 处理单个文件刮削, 首个刮削某番号的任务会把番号加入 claim, 由调用方在完成后设置该番号的结果
     # 初始化所需变量
     start_time = time.time()
     read_mode = config.read_mode
@@ -105,15 +107,14 @@ def _scrape_one_file(file_path, file_info, file_mode):
 
     # 刮削json_data
     # 获取已刮削的json_data
-    if "." in movie_number or json_data["mosaic"] in ["国产"]:
-        pass
-    elif movie_number not in Flags.json_get_set:
-        Flags.json_get_set.add(movie_number)
-    elif not Flags.json_data_dic.get(movie_number):
-        while not Flags.json_data_dic.get(movie_number):
-            time.sleep(1)
-
-    json_data_old = Flags.json_data_dic.get(movie_number)
+    json_data_old = None
+    if _can_share_json_data(json_data, movie_number):
+        future = Future()
+        old_future = Flags.json_future_dic.setdefault(movie_number, future)
+        if old_future is future:
+            claim.append(movie_number)
+        else:
+            json_data_old = old_future.result()  # 等待的任务已在完成后才重新加入线程池, 这里通常无需等待
     if (
         json_data_old and "." not in movie_number and json_data["mosaic"] not in ["国产"]
     ):  # 已存在该番号数据时直接使用该数据
@@ -159,7 +160,8 @@ def _scrape_one_file(file_path, file_info, file_mode):
             json_data_new["mosaic"] = json_data["mosaic"]
         json_data.update(json_data_new)
     elif not json_data["nfo_update"]:
-        json_data = crawl(json_data, file_mode)
+        with Flags.pipeline.crawl:
+            json_data = crawl(json_data, file_mode)
 
     # 显示json_data结果或日志
     json_data["failed_folder"] = failed_folder
@@ -169,13 +171,14 @@ def _scrape_one_file(file_path, file_info, file_mode):
     # 映射或翻译
     # 当不存在已刮削数据，或者读取模式允许翻译映射时才进行映射翻译
     if not json_data_old and json_data["nfo_can_translate"]:
-        deal_some_field(json_data)  # 处理字段
-        replace_special_word(json_data)  # 替换特殊字符
-        translate_title_outline(json_data, movie_number)  # 翻译json_data（标题/介绍）
-        deal_some_field(json_data)  # 再处理一遍字段，翻译后可能出现要去除的内容
-        translate_actor(json_data)  # 映射输出演员名/信息
-        translate_info(json_data)  # 映射输出标签等信息
-        replace_word(json_data)
+        with Flags.pipeline.crawl:
+            deal_some_field(json_data)  # 处理字段
+            replace_special_word(json_data)  # 替换特殊字符
+            translate_title_outline(json_data, movie_number)  # 翻译json_data（标题/介绍）
+            deal_some_field(json_data)  # 再处理一遍字段，翻译后可能出现要去除的内容
+            translate_actor(json_data)  # 映射输出演员名/信息
+            translate_info(json_data)  # 映射输出标签等信息
+            replace_word(json_data)
 
     # 更新视频分辨率
     get_video_size(json_data, file_path)
@@ -240,98 +243,108 @@ def _scrape_one_file(file_path, file_info, file_mode):
 
     # 视频模式（原来叫整理模式）
     # 视频模式（仅根据刮削数据把电影命名为番号并分类到对应目录名称的文件夹下）
+    disk_stage = Flags.pipeline.disk(folder_new_path)
     if config.main_mode == 2:
         # 移动文件
-        if move_movie(json_data, file_path, file_new_path):
-            if "sort_del" in config.switch_on:
-                deal_old_files(
-                    json_data,
-                    folder_old_path,
-                    folder_new_path,
-                    file_path,
-                    file_new_path,
-                    thumb_new_path_with_filename,
-                    poster_new_path_with_filename,
-                    fanart_new_path_with_filename,
-                    nfo_new_path,
-                    file_ex,
-                    poster_final_path,
-                    thumb_final_path,
-                    fanart_final_path,
-                )  # 清理旧的thumb、poster、fanart、nfo
-            save_success_list(file_path, file_new_path)  # 保存成功列表
-            return True, json_data
-        else:
-            # 返回MDCx1_1main, 继续处理下一个文件
-            return False, json_data
+        with disk_stage:
+            if move_movie(json_data, file_path, file_new_path):
+                if "sort_del" in config.switch_on:
+                    deal_old_files(
+                        json_data,
+                        folder_old_path,
+                        folder_new_path,
+                        file_path,
+                        file_new_path,
+                        thumb_new_path_with_filename,
+                        poster_new_path_with_filename,
+                        fanart_new_path_with_filename,
+                        nfo_new_path,
+                        file_ex,
+                        poster_final_path,
+                        thumb_final_path,
+                        fanart_final_path,
+                    )  # 清理旧的thumb、poster、fanart、nfo
+                save_success_list(file_path, file_new_path)  # 保存成功列表
+                return True, json_data
+            else:
+                # 返回MDCx1_1main, 继续处理下一个文件
+                return False, json_data
 
     # 清理旧的thumb、poster、fanart、extrafanart、nfo
-    pic_final_catched, single_folder_catched = deal_old_files(
-        json_data,
-        folder_old_path,
-        folder_new_path,
-        file_path,
-        file_new_path,
-        thumb_new_path_with_filename,
-        poster_new_path_with_filename,
-        fanart_new_path_with_filename,
-        nfo_new_path,
-        file_ex,
-        poster_final_path,
-        thumb_final_path,
-        fanart_final_path,
-    )
+    with disk_stage:
+        pic_final_catched, single_folder_catched = deal_old_files(
+            json_data,
+            folder_old_path,
+            folder_new_path,
+            file_path,
+            file_new_path,
+            thumb_new_path_with_filename,
+            poster_new_path_with_filename,
+            fanart_new_path_with_filename,
+            nfo_new_path,
+            file_ex,
+            poster_final_path,
+            thumb_final_path,
+            fanart_final_path,
+        )
 
     # 如果 final_pic_path 没处理过，这时才需要下载和加水印
     if pic_final_catched:
         if json_data["file_can_download"]:
-            # 下载thumb
-            if not thumb_download(json_data, folder_new_path, thumb_final_path):
-                return False, json_data  # 返回MDCx1_1main, 继续处理下一个文件
+            with Flags.pipeline.download:
+                # 下载thumb
+                if not thumb_download(json_data, folder_new_path, thumb_final_path):
+                    return False, json_data  # 返回MDCx1_1main, 继续处理下一个文件
 
-            # 下载艺术图
-            fanart_download(json_data, fanart_final_path)
+                # 下载艺术图
+                fanart_download(json_data, fanart_final_path)
 
-            # 下载poster
-            if not poster_download(json_data, folder_new_path, poster_final_path):
-                return False, json_data  # 返回MDCx1_1main, 继续处理下一个文件
+                # 下载poster
+                if not poster_download(json_data, folder_new_path, poster_final_path):
+                    return False, json_data  # 返回MDCx1_1main, 继续处理下一个文件
 
-            # 清理冗余图片
-            _pic_some_deal(json_data, thumb_final_path, fanart_final_path)
+            with Flags.pipeline.image:
+                # 清理冗余图片
+                _pic_some_deal(json_data, thumb_final_path, fanart_final_path)
 
-            # 加水印
-            add_mark(json_data, json_data["poster_marked"], json_data["thumb_marked"], json_data["fanart_marked"])
+                # 加水印
+                add_mark(json_data, json_data["poster_marked"], json_data["thumb_marked"], json_data["fanart_marked"])
 
             # 下载剧照和剧照副本
             if single_folder_catched:
-                extrafanart_download(json_data, folder_new_path)
-                extrafanart_copy2(json_data, folder_new_path)
-                extrafanart_extras_copy(json_data, folder_new_path)
+                with Flags.pipeline.download:
+                    extrafanart_download(json_data, folder_new_path)
+                with disk_stage:
+                    extrafanart_copy2(json_data, folder_new_path)
+                    extrafanart_extras_copy(json_data, folder_new_path)
 
             # 下载trailer、复制主题视频
             # 因为 trailer也有带文件名，不带文件名两种情况，不能使用pic_final_catched。比如图片不带文件名，trailer带文件名这种场景需要支持每个分集去下载trailer
-            trailer_download(json_data, folder_new_path, folder_old_path, naming_rule)
-            copy_trailer_to_theme_videos(json_data, folder_new_path, naming_rule)
-
-    # 生成nfo文件
-    write_nfo(json_data, nfo_new_path, folder_new_path, file_path)
-
-    # 移动字幕、种子、bif、trailer、其他文件
-    move_sub(json_data, folder_old_path, folder_new_path, file_name, sub_list, naming_rule)
-    move_torrent(json_data, folder_old_path, folder_new_path, file_name, movie_number, naming_rule)
-    move_bif(json_data, folder_old_path, folder_new_path, file_name, naming_rule)
-    # self.move_trailer_video(json_data, folder_old_path, folder_new_path, file_name, naming_rule)
-    move_other_file(json_data, folder_old_path, folder_new_path, file_name, naming_rule)
+            with Flags.pipeline.download:
+                trailer_download(json_data, folder_new_path, folder_old_path, naming_rule)
+            with disk_stage:
+                copy_trailer_to_theme_videos(json_data, folder_new_path, naming_rule)
+
+    with disk_stage:
+        # 生成nfo文件
+        write_nfo(json_data, nfo_new_path, folder_new_path, file_path)
+
+        # 移动字幕、种子、bif、trailer、其他文件
+        move_sub(json_data, folder_old_path, folder_new_path, file_name, sub_list, naming_rule)
+        move_torrent(json_data, folder_old_path, folder_new_path, file_name, movie_number, naming_rule)
+        move_bif(json_data, folder_old_path, folder_new_path, file_name, naming_rule)
+        # self.move_trailer_video(json_data, folder_old_path, folder_new_path, file_name, naming_rule)
+        move_other_file(json_data, folder_old_path, folder_new_path, file_name, naming_rule)
 
-    # 移动文件
-    if not move_movie(json_data, file_path, file_new_path):
-        return False, json_data  # 返回MDCx1_1main, 继续处理下一个文件
-    save_success_list(file_path, file_new_path)  # 保存成功列表
+        # 移动文件
+        if not move_movie(json_data, file_path, file_new_path):
+            return False, json_data  # 返回MDCx1_1main, 继续处理下一个文件
+        save_success_list(file_path, file_new_path)  # 保存成功列表
 
-    # 创建软链接及复制文件
-    if config.auto_link:
-        target_dir = os.path.join(config.localdisk_path, os.path.relpath(folder_new_path, success_folder))
-        newtdisk_creat_symlink("copy_netdisk_nfo" in config.switch_on, folder_new_path, target_dir)
+        # 创建软链接及复制文件
+        if config.auto_link:
+            target_dir = os.path.join(config.localdisk_path, os.path.relpath(folder_new_path, success_folder))
+            newtdisk_creat_symlink("copy_netdisk_nfo" in config.switch_on, folder_new_path, target_dir)
 
     # json添加封面缩略图路径
     # json_data['number'] = movie_number
@@ -344,6 +357,41 @@ def _scrape_one_file(file_path, file_info, file_mode):
     return True, json_data
 
 
+def _can_share_json_data(json_data, movie_number):
+    """
+    相同番号的文件是否共用首个文件的刮削结果
+    """
+    return "." not in movie_number and json_data["mosaic"] not in ["国产"]
+
+
+def _set_json_result(movie_number, json_data):
+    """
+    设置番号的刮削结果, 唤醒等待该番号的任务
+    """
+    future = Flags.json_future_dic.get(movie_number)
+    if future and not future.done():
+        future.set_result(json_data)
+
+
+def _requeue(run):
+    """
+    将等待中的任务重新加入线程池
+    """
+
+    def task():
+        try:
+            run()
+        finally:
+            with Flags.lock:
+                Flags.scrape_waiting -= 1
+
+    try:
+        Flags.pool.submit(task)
+    except RuntimeError:  # 已停止刮削, 线程池已关闭
+        with Flags.lock:
+            Flags.scrape_waiting -= 1
+
+
 def _scrape_exec_thread(task):
     # 获取顺序
     with Flags.lock:
@@ -365,30 +413,10 @@ def _scrape_exec_thread(task):
         _check_stop(file_name_temp)
         time.sleep(1)
 
-    # 非第一个加延时
+    # 不再按线程延时错开启动, 各网站的请求频率由 config.rate_limit 控制
     Flags.scrape_starting += 1
-    count = Flags.scrape_starting
-    thread_time = config.thread_time
-    if count == 1 or thread_time == 0 or config.main_mode == 4:
-        Flags.next_start_time = time.time()
-        signal.show_log_text(f" 🕷 {get_current_time()} 开始刮削：{Flags.scrape_starting}/{count_all} {file_name_temp}")
-        thread_time = 0
-    else:
-        Flags.next_start_time += thread_time
-
-    # 计算本线程开始剩余时间, 休眠并定时检查是否手动停止
-    remain_time = int(Flags.next_start_time - time.time())
-    if remain_time > 0:
-        signal.show_log_text(
-            f" ⏱ {get_current_time()}（{remain_time}）秒后开始刮削：{count}/{count_all} {file_name_temp}"
-        )
-        for i in range(remain_time):
-            _check_stop(file_name_temp)
-            time.sleep(1)
-
     Flags.scrape_started += 1
-    if count > 1 and thread_time != 0:
-        signal.show_log_text(f" 🕷 {get_current_time()} 开始刮削：{Flags.scrape_started}/{count_all} {file_name_temp}")
+    signal.show_log_text(f" 🕷 {get_current_time()} 开始刮削：{Flags.scrape_started}/{count_all} {file_name_temp}")
 
     start_time = time.time()
     file_mode = Flags.file_mode
@@ -416,134 +444,152 @@ def _scrape_exec_thread(task):
     if config.scrape_like == "single" and file_mode != FileMode.Single and config.main_mode != 4:
         json_data["logs"] += f"\n 😸 [Note] You specified 「 {website_single} 」, some videos may not have results! "
 
-    # 获取刮削数据
-    try:
-        result, json_data = _scrape_one_file(file_path, file_info, file_mode)
-        if json_data["req_web"] != "do_not_update_json_data_dic":
-            Flags.json_data_dic.update({movie_number: json_data})
-    except Exception as e:
-        _check_stop(file_name_temp)
-        signal.show_traceback_log(traceback.format_exc())
-        signal.show_log_text(traceback.format_exc())
-        json_data["error_info"] = "c1oreMain error: " + str(e)
-        json_data["logs"] += "\n" + traceback.format_exc()
-        result = False
-
-    # 显示刮削数据
-    try:
-        if result:
-            Flags.succ_count += 1
-            succ_show_name = (
-                str(Flags.count_claw)
-                + "-"
-                + str(Flags.succ_count)
-                + "."
-                + file_show_name.replace(movie_number, json_data["number"])
-                + json_data["4K"]
-            )
-            signal.show_list_name(succ_show_name, "succ", json_data, movie_number)
-        else:
-            Flags.fail_count += 1
-            fail_show_name = (
-                str(Flags.count_claw)
-                + "-"
-                + str(Flags.fail_count)
-                + "."
-                + file_show_name.replace(movie_number, json_data["number"])
-                + json_data["4K"]
-            )
-            signal.show_list_name(fail_show_name, "fail", json_data, movie_number)
-            if json_data["error_info"]:
-                json_data["logs"] += f'\n 🔴 [Failed] Reason: {json_data["error_info"]}'
-                if "WinError 5" in json_data["error_info"]:
-                    json_data["logs"] += (
-                        "\n 🔴 该问题为权限问题：请尝试以管理员身份运行，同时关闭其他正在运行的Python脚本！"
-                    )
-            fail_file_path = move_file_to_failed_folder(json_data, file_path, folder_old_path, file_ex)
-            Flags.failed_list.append([fail_file_path, json_data["error_info"]])
-            Flags.failed_file_list.append(fail_file_path)
-            _failed_file_info_show(str(Flags.fail_count), fail_file_path, json_data["error_info"])
-            signal.view_failed_list_settext.emit(f"失败 {Flags.fail_count}")
-    except Exception as e:
-        _check_stop(file_name_temp)
-        signal.show_traceback_log(traceback.format_exc())
-        signal.show_log_text(traceback.format_exc())
-        signal.show_log_text(str(e))
-
-    # 显示刮削结果
-    with Flags.lock:
+    def run():
+        nonlocal json_data, file_path, count
+        # 获取刮削数据
+        claim = []
+        try:
+            result, json_data = _scrape_one_file(file_path, file_info, file_mode, claim)
+            if json_data["req_web"] != "do_not_update_json_data_dic":
+                for each in claim:
+                    _set_json_result(each, json_data)
+        except Exception as e:
+            _check_stop(file_name_temp)
+            signal.show_traceback_log(traceback.format_exc())
+            signal.show_log_text(traceback.format_exc())
+            json_data["error_info"] = "c1oreMain error: " + str(e)
+            json_data["logs"] += "\n" + traceback.format_exc()
+            result = False
+        finally:
+            # 未能获取有效数据时结果为 None，等待的任务将自行刮削
+            for each in claim:
+                _set_json_result(each, None)
+
+        # 显示刮削数据
         try:
-            Flags.scrape_done += 1
-            count = Flags.scrape_done
-            progress_value = count / count_all * 100
-            progress_percentage = f"{progress_value:.2f}%"
-            used_time = get_used_time(start_time)
-            scrape_info_begin = f"{count:d}/{count_all:d} ({progress_percentage}) round({Flags.count_claw}) {split_path(file_path)[1]}    新的刮削线程"
-            scrape_info_begin = "\n\n\n" + "👇" * 50 + "\n" + scrape_info_begin
-            scrape_info_after = f"\n 🕷 {get_current_time()} {count}/{count_all} {split_path(file_path)[1]} 刮削完成！用时 {used_time} 秒！"
-            json_data["logs"] = scrape_info_begin + json_data["logs"] + scrape_info_after
-            signal.show_log_text(json_data["logs"])
-            remain_count = Flags.scrape_started - count
-            if Flags.scrape_started == count_all:
-                signal.show_log_text(f" 🕷 剩余正在刮削的线程：{remain_count}")
-            signal.label_result.emit(f" 刮削中：{remain_count} 成功：{Flags.succ_count} 失败：{Flags.fail_count}")
-            signal.show_scrape_info(f"🔎 已刮削 {count}/{count_all}")
+            if result:
+                Flags.succ_count += 1
+                succ_show_name = (
+                    str(Flags.count_claw)
+                    + "-"
+                    + str(Flags.succ_count)
+                    + "."
+                    + file_show_name.replace(movie_number, json_data["number"])
+                    + json_data["4K"]
+                )
+                signal.show_list_name(succ_show_name, "succ", json_data, movie_number)
+            else:
+                Flags.fail_count += 1
+                fail_show_name = (
+                    str(Flags.count_claw)
+                    + "-"
+                    + str(Flags.fail_count)
+                    + "."
+                    + file_show_name.replace(movie_number, json_data["number"])
+                    + json_data["4K"]
+                )
+                signal.show_list_name(fail_show_name, "fail", json_data, movie_number)
+                if json_data["error_info"]:
+                    json_data["logs"] += f'\n 🔴 [Failed] Reason: {json_data["error_info"]}'
+                    if "WinError 5" in json_data["error_info"]:
+                        json_data["logs"] += (
+                            "\n 🔴 该问题为权限问题：请尝试以管理员身份运行，同时关闭其他正在运行的Python脚本！"
+                        )
+                fail_file_path = move_file_to_failed_folder(json_data, file_path, folder_old_path, file_ex)
+                Flags.failed_list.append([fail_file_path, json_data["error_info"]])
+                Flags.failed_file_list.append(fail_file_path)
+                _failed_file_info_show(str(Flags.fail_count), fail_file_path, json_data["error_info"])
+                signal.view_failed_list_settext.emit(f"失败 {Flags.fail_count}")
         except Exception as e:
             _check_stop(file_name_temp)
             signal.show_traceback_log(traceback.format_exc())
             signal.show_log_text(traceback.format_exc())
             signal.show_log_text(str(e))
 
-        # 更新剩余任务
-        try:
-            if file_path:
-                file_path = convert_path(file_path)
+        # 显示刮削结果
+        with Flags.lock:
+            try:
+                Flags.scrape_done += 1
+                count = Flags.scrape_done
+                progress_value = count / count_all * 100
+                progress_percentage = f"{progress_value:.2f}%"
+                used_time = get_used_time(start_time)
+                scrape_info_begin = f"{count:d}/{count_all:d} ({progress_percentage}) round({Flags.count_claw}) {split_path(file_path)[1]}    新的刮削线程"
+                scrape_info_begin = "\n\n\n" + "👇" * 50 + "\n" + scrape_info_begin
+                scrape_info_after = f"\n 🕷 {get_current_time()} {count}/{count_all} {split_path(file_path)[1]} 刮削完成！用时 {used_time} 秒！"
+                json_data["logs"] = scrape_info_begin + json_data["logs"] + scrape_info_after
+                signal.show_log_text(json_data["logs"])
+                if count % 10 == 0 and count < count_all:  # 每完成 10 个文件显示一次各阶段状态
+                    signal.show_log_text(Flags.pipeline.get_info())
+                remain_count = Flags.scrape_started - count
+                if Flags.scrape_started == count_all:
+                    signal.show_log_text(f" 🕷 剩余正在刮削的线程：{remain_count}")
+                signal.label_result.emit(f" 刮削中：{remain_count} 成功：{Flags.succ_count} 失败：{Flags.fail_count}")
+                signal.show_scrape_info(f"🔎 已刮削 {count}/{count_all}")
+            except Exception as e:
+                _check_stop(file_name_temp)
+                signal.show_traceback_log(traceback.format_exc())
+                signal.show_log_text(traceback.format_exc())
+                signal.show_log_text(str(e))
+
+            # 更新剩余任务
             try:
-                Flags.remain_list.remove(file_path)
-                Flags.can_save_remain = True
-            except Exception as e1:
-                signal.show_log_text(f"remove:  {file_path}\n {str(e1)}\n {traceback.format_exc()}")
+                if file_path:
+                    file_path = convert_path(file_path)
+                try:
+                    Flags.remain_list.remove(file_path)
+                    Flags.can_save_remain = True
+                except Exception as e1:
+                    signal.show_log_text(f"remove:  {file_path}\n {str(e1)}\n {traceback.format_exc()}")
+            except Exception as e:
+                _check_stop(file_name_temp)
+                signal.show_traceback_log(traceback.format_exc())
+                signal.show_log_text(traceback.format_exc())
+                signal.show_log_text(str(e))
+
+        # 处理间歇刮削
+        try:
+            if config.main_mode != 4 and "rest_scrape" in config.switch_on:
+                time_note = f" 🏖 已累计刮削 {count}/{count_all}，已连续刮削 {count - Flags.rest_now_begin_count}/{config.rest_count}..."
+                signal.show_log_text(time_note)
+                if count - Flags.rest_now_begin_count >= config.rest_count:
+                    if Flags.scrape_starting > count:
+                        time_note = f" 🏖 当前还存在 {Flags.scrape_starting - count} 个已经在刮削的任务，等待这些任务结束将进入休息状态...\n"
+                        signal.show_log_text(time_note)
+                        while not Flags.rest_sleepping:
+                            time.sleep(1)
+                    elif not Flags.rest_sleepping and count < count_all:
+                        Flags.rest_sleepping = True  # 开始休眠
+                        Flags.rest_next_begin_time = time.time()  # 下一轮倒计时开始时间
+                        time_note = f'\n ⏸ 休息 {Flags.rest_time_convert} 秒，将在 <font color="red">{get_real_time(Flags.rest_next_begin_time + Flags.rest_time_convert)}</font> 继续刮削剩余的 {count_all - count} 个任务...\n'
+                        signal.show_log_text(time_note)
+                        while (
+                            "rest_scrape" in config.switch_on
+                            and time.time() - Flags.rest_next_begin_time < Flags.rest_time_convert
+                        ):
+                            if Flags.scrape_starting > count:  # 如果突然调大了文件数量，这时跳出休眠
+                                break
+                            time.sleep(1)
+                        Flags.rest_now_begin_count = count
+                        Flags.rest_sleepping = False  # 休眠结束，下一轮开始
+                    else:
+                        while Flags.rest_sleepping:
+                            time.sleep(1)
+
         except Exception as e:
             _check_stop(file_name_temp)
             signal.show_traceback_log(traceback.format_exc())
             signal.show_log_text(traceback.format_exc())
             signal.show_log_text(str(e))
 
-    # 处理间歇刮削
-    try:
-        if config.main_mode != 4 and "rest_scrape" in config.switch_on:
-            time_note = f" 🏖 已累计刮削 {count}/{count_all}，已连续刮削 {count - Flags.rest_now_begin_count}/{config.rest_count}..."
-            signal.show_log_text(time_note)
-            if count - Flags.rest_now_begin_count >= config.rest_count:
-                if Flags.scrape_starting > count:
-                    time_note = f" 🏖 当前还存在 {Flags.scrape_starting - count} 个已经在刮削的任务，等待这些任务结束将进入休息状态...\n"
-                    signal.show_log_text(time_note)
-                    while not Flags.rest_sleepping:
-                        time.sleep(1)
-                elif not Flags.rest_sleepping and count < count_all:
-                    Flags.rest_sleepping = True  # 开始休眠
-                    Flags.rest_next_begin_time = time.time()  # 下一轮倒计时开始时间
-                    time_note = f'\n ⏸ 休息 {Flags.rest_time_convert} 秒，将在 <font color="red">{get_real_time(Flags.rest_next_begin_time + Flags.rest_time_convert)}</font> 继续刮削剩余的 {count_all - count} 个任务...\n'
-                    signal.show_log_text(time_note)
-                    while (
-                        "rest_scrape" in config.switch_on
-                        and time.time() - Flags.rest_next_begin_time < Flags.rest_time_convert
-                    ):
-                        if Flags.scrape_starting > count:  # 如果突然调大了文件数量，这时跳出休眠
-                            break
-                        time.sleep(1)
-                    Flags.rest_now_begin_count = count
-                    Flags.rest_sleepping = False  # 休眠结束，下一轮开始
-                    Flags.next_start_time = time.time() - config.thread_time
-                else:
-                    while Flags.rest_sleepping:
-                        time.sleep(1)
-
-    except Exception as e:
-        _check_stop(file_name_temp)
-        signal.show_traceback_log(traceback.format_exc())
-        signal.show_log_text(traceback.format_exc())
-        signal.show_log_text(str(e))
+    # 相同番号的文件正在刮削时，先让出线程，等其完成后再重新加入线程池
+    future = Flags.json_future_dic.get(movie_number) if _can_share_json_data(json_data, movie_number) else None
+    if future and not future.done():
+        with Flags.lock:
+            Flags.scrape_waiting += 1
+        future.add_done_callback(lambda _: _requeue(run))
+        return
+    run()
 
 
 def scrape(file_mode: FileMode, movie_list):
@@ -557,7 +603,6 @@ def scrape(file_mode: FileMode, movie_list):
 
     signal.add_label_info({})  # 清空主界面显示信息
     thread_number = config.thread_number  # 线程数量
-    thread_time = config.thread_time  # 线程延时
     signal.label_result.emit(f" 刮削中：{0} 成功：{Flags.succ_count} 失败：{Flags.fail_count}")
     signal.logs_failed_settext.emit("\n\n\n")
 
@@ -604,11 +649,11 @@ def scrape(file_mode: FileMode, movie_list):
     if count_all:
         Flags.count_claw += 1
         if config.main_mode == 4:
-            signal.show_log_text(f" 🕷 当前为读取模式，线程数量（{thread_number}），线程延时（0）秒...")
+            signal.show_log_text(f" 🕷 当前为读取模式，线程数量（{thread_number}）...")
         else:
             if count_all < thread_number:
                 thread_number = count_all
-            signal.show_log_text(f" 🕷 开启多线程，线程数量（{thread_number}），线程延时（{thread_time}）秒...")
+            signal.show_log_text(f" 🕷 开启多线程，线程数量（{thread_number}）...")
         if "rest_scrape" in config.switch_on and config.main_mode != 4:
             signal.show_log_text(
                 f'<font color="brown"> 🍯 间歇刮削 已启用，连续刮削 {config.rest_count} 个文件后，将自动休息 {Flags.rest_time_convert} 秒...</font>'
@@ -621,10 +666,14 @@ def scrape(file_mode: FileMode, movie_list):
         # 创建线程锁，避免多分集删除或操作相同图片文件的问题
         Flags.lock = threading.Lock()
 
-        # 创建线程池
-        Flags.next_start_time = time.time()
+        # 创建线程池，线程数量即同时刮削的文件数量，各阶段的并发数量由 config.stage_limit 限制
+        Flags.pipeline = ScrapePipeline(config.stage_limit_dic)
         Flags.pool = Pool(thread_number, "MDCx-Pool")
-        Flags.pool.map(_scrape_exec_thread, task_list)
+        wait([Flags.pool.submit(_scrape_exec_thread, each) for each in task_list])
+
+        # 等待相同番号的任务会在稍后重新加入线程池，需等这些任务完成后再关闭线程池
+        while Flags.scrape_waiting and not signal.stop:
+            time.sleep(0.1)
 
         # self.extrafanart_pool.shutdown(wait=True)
         Flags.pool.shutdown(wait=True)
@@ -663,6 +712,15 @@ def scrape(file_mode: FileMode, movie_list):
     signal.show_log_text(" ⏱ Used time".ljust(15) + f": {used_time}S")
     signal.show_log_text(" 📺 Movies num".ljust(15) + f": {count_all}")
     signal.show_log_text(" 🍕 Per time".ljust(15) + f": {average_time}S")
+    if count_all and Flags.pipeline:
+        signal.show_log_text("================================================================================")
+        signal.show_log_text(Flags.pipeline.get_info())
+        if image_pool.get_info():
+            signal.show_log_text(image_pool.get_info())
+    site_info = site_stats.get_info()
+    if count_all and site_info:
+        signal.show_log_text("================================================================================")
+        signal.show_log_text(site_info)
     signal.show_log_text("================================================================================")
     signal.show_scrape_info(f"🎉 刮削完成 {count_all}/{count_all}")
 
@@ -728,6 +786,8 @@ def _failed_file_info_show(count, path, error_info):
 
 
 def get_remain_list():
+    from PyQt5.QtWidgets import QMessageBox  # 仅图形界面使用, 无界面模式不加载 Qt
+
     remain_list_path = resources.userdata_path("remain.txt")
     if os.path.isfile(remain_list_path):
         with open(remain_list_path, encoding="utf-8", errors="ignore") as f:
@@ -0,0 +1,118 @@
+"""
+各网站刮削结果的滚动统计: 成功率(按番号前缀分组)、用时中位数及 P95、最近的错误类型
+开启自适应网站顺序时, 在用户设置的网站范围内, 将近期成功率低或用时 P95 超过超时时间的网站后移(后移的网站按用时中位数排序),
+连续出错的网站暂时跳过
+"""
+
+import threading
+import time
+from collections import deque
+
+WINDOW = 50  # 每个网站保留的最近请求数量
+FAMILY_WINDOW = 20  # 每个网站的每个番号前缀保留的最近请求数量
+MIN_SAMPLES = 5  # 请求数量达到后才计算成功率
+LOW_RATE = 0.3  # 成功率低于此值时后移
+ERROR_STREAK = 5  # 连续出错(网络错误、被拦截等, 不含未找到番号)达到此次数时暂时跳过
+SKIP_TIME = 300  # 跳过时长(秒), 之后再次尝试
+NOT_FOUND = "未找到"  # 网站没有此番号, 不计入连续出错
+
+
+def _percentile(sorted_list, percent):
+    if not sorted_list:
+        return 0
+    return sorted_list[min(int(len(sorted_list) * percent), len(sorted_list) - 1)]
+
+
+class SiteStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {}  # {网站: deque[(是否成功, 用时, 错误类型)]}
+        self.family_records = {}  # {(网站, 番号前缀): deque[是否成功]}
+        self.error_streak = {}  # {网站: 连续出错次数}
+        self.skip_until = {}  # {网站: 恢复尝试的时间}
+
+    def record(self, website, letters, success, used_time, error_type=""):
+        """
+        记录一次实际的网站请求
+        :param error_type: 失败原因, NOT_FOUND 表示网站没有此番号, 其他值视为出错
+        """
+        with self.lock:
+            self.records.setdefault(website, deque(maxlen=WINDOW)).append((success, used_time, error_type))
+            self.family_records.setdefault((website, letters), deque(maxlen=FAMILY_WINDOW)).append(success)
+            if success or error_type == NOT_FOUND:
+                self.error_streak[website] = 0
+                self.skip_until.pop(website, None)
+            else:
+                self.error_streak[website] = self.error_streak.get(website, 0) + 1
+                if self.error_streak[website] >= ERROR_STREAK:
+                    self.skip_until[website] = time.time() + SKIP_TIME
+
+    def _get_rate(self, website, letters):
+        records = self.family_records.get((website, letters))
+        if not records or len(records) < MIN_SAMPLES:
+            records = [each[0] for each in self.records.get(website, [])]
+        if len(records) < MIN_SAMPLES:
+            return None
+        return sum(records) / len(records)
+
+    def _get_latency(self, website):
+        """
+        返回 (用时中位数, 用时 P95), 请求数量不足时返回 None
+        """
+        records = self.records.get(website, [])
+        if len(records) < MIN_SAMPLES:
+            return None
+        used_time_list = sorted(each[1] for each in records)
+        return _percentile(used_time_list, 0.5), _percentile(used_time_list, 0.95)
+
+    def order(self, website_list, letters, timeout=0):
+        """
+        返回 (调整后的网站列表, 跳过的网站列表)
+        正常的网站保持设置中的相对顺序; 用时 P95 超过 timeout 的网站其次, 成功率低的网站最后, 这两组按用时中位数排序
+        :param timeout: 单次刮削(包含该网站的所有请求及重试)的用时上限, 为 0 时不按用时后移
+        """
+        now = time.time()
+        with self.lock:
+            skip_list = [each for each in website_list if self.skip_until.get(each, 0) > now]
+            if len(skip_list) == len(website_list):  # 全部跳过时不跳过
+                skip_list = []
+            new_list = [each for each in website_list if each not in skip_list]
+            normal_list, slow_list, low_list = [], [], []
+            p50_dic = {}
+            for each in new_list:
+                rate = self._get_rate(each, letters)
+                latency = self._get_latency(each)
+                p50_dic[each] = latency[0] if latency else 0
+                if rate is not None and rate < LOW_RATE:
+                    low_list.append(each)
+                elif timeout and latency and latency[1] > timeout:
+                    slow_list.append(each)
+                else:
+                    normal_list.append(each)
+        new_list = normal_list + sorted(slow_list, key=p50_dic.get) + sorted(low_list, key=p50_dic.get)
+        return new_list, skip_list
+
+    def get_info(self):
+        """
+        返回各网站的统计信息
+        """
+        info_list = []
+        now = time.time()
+        with self.lock:
+            for website, records in sorted(self.records.items()):
+                used_time_list = sorted(each[1] for each in records)
+                success_count = sum(each[0] for each in records)
+                error_list = [each[2] for each in records if not each[0] and each[2]][-3:]
+                info = (
+                    f"{website:<12} 请求: {len(records):<4} 成功率: {success_count * 100 // len(records):>3}%  "
+                    f"P50: {_percentile(used_time_list, 0.5):.1f}S  P95: {_percentile(used_time_list, 0.95):.1f}S"
+                )
+                if error_list:
+                    info += f"  最近错误: {','.join(error_list)}"
+                if self.skip_until.get(website, 0) > now:
+                    info += "  (暂时跳过)"
+                info_list.append(info)
+        return "\n".join(info_list)
+
+
+site_stats = SiteStats()
@@ -162,8 +162,7 @@ def deepl_translate(title, outline, ls="JA", json_data=None):
 
 
 def translate_info(json_data):
-    xml_info = resources.info_mapping_data
-    if len(xml_info) == 0:
+    if not resources.info_mapping_index[1]:
         return json_data
     tag_translate = config.tag_translate
     series_translate = config.series_translate
@@ -341,8 +340,7 @@ def translate_actor(json_data):
         return json_data
 
     # 映射表数据加载失败，返回
-    xml_actor = resources.actor_mapping_data
-    if len(xml_actor) == 0:
+    if not resources.actor_mapping_index[1]:
         return json_data
 
     # 未知演员，返回
@@ -17,6 +17,7 @@ from models.base.path import get_main_path, get_path
 from models.base.utils import convert_path, get_used_time
 from models.config.config import config
 from models.config.resources import resources
+from models.crawlers import find_crawler_by_url
 from models.signals import signal
 from itertools import product
 from collections import defaultdict
@@ -185,6 +186,11 @@ def deal_url(url):
             if web_url in url:
                 return web_name, url
 
+    # 第三方爬虫声明的网址
+    web_name = find_crawler_by_url(url)
+    if web_name:
+        return web_name, url
+
     return False, url
 
 
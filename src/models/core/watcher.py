@@ -0,0 +1,153 @@
+"""
+监控待刮削目录, 发现新增且已写入完成的视频文件后交给刮削
+使用 watchdog 监听系统文件事件(inotify/FSEvents/ReadDirectoryChangesW); 未安装时退化为定时遍历目录, 对比各文件夹的文件名
+"""
+
+import os
+import threading
+import time
+import traceback
+
+from models.config.config import config
+from models.core.file import is_new_movie_file
+from models.core.utils import get_movie_path_setting
+from models.signals import signal
+
+POLL_INTERVAL = 60  # 未安装 watchdog 时遍历目录的间隔(秒)
+
+
+class MediaWatcher:
+    def __init__(self, on_ready):
+        """
+        :param on_ready: 接收新文件路径列表的函数, 返回 False 表示暂时无法刮削(如正在刮削中), 稍后重试
+        """
+        self.on_ready = on_ready
+        self.lock = threading.Lock()
+        self.pending = {}  # 等待写入完成的文件 {路径: [文件大小, 大小不再变化的开始时间]}
+        self.ready_list = []  # 已写入完成, 等待刮削的文件
+        self.movie_path = ""
+        self.observer = None
+        self.folder_files_dic = {}  # 轮询模式下各文件夹中的文件名
+        self.running = False
+        self.thread = None
+
+    def start(self, movie_path):
+        if self.running and movie_path == self.movie_path:
+            return
+        self.stop()
+        self.movie_path = movie_path
+        if not os.path.isdir(movie_path):
+            signal.show_log_text(f" 🔴 监控目录不存在！{movie_path}")
+            return
+        self.running = True
+        try:
+            self._start_observer()
+            mode = "watchdog"
+        except ImportError:
+            self.folder_files_dic = self._scan_folders()
+            mode = f"轮询（{POLL_INTERVAL}秒）"
+            signal.show_log_text(" ⚠️ 未安装 watchdog，改为定时遍历整个目录检查新文件，目录较大时开销较高")
+        self.thread = threading.Thread(target=self._run, name="MDCx-Watcher", daemon=True)
+        self.thread.start()
+        signal.show_log_text(f" 👀 已开始监控目录（{mode}）：{movie_path}")
+
+    def stop(self):
+        self.running = False
+        if self.observer:
+            try:
+                self.observer.stop()
+            except Exception:
+                pass
+            self.observer = None
+        self.thread = None
+        with self.lock:
+            self.pending.clear()
+
+    def add(self, path):
+        """
+        记录新增或修改的文件, 待其大小稳定后刮削
+        """
+        with self.lock:
+            if path not in self.ready_list:
+                self.pending[path] = [-1, time.time()]
+
+    def _start_observer(self):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher.add(event.src_path)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher.add(event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    watcher.add(event.dest_path)
+
+        self.observer = Observer()
+        self.observer.daemon = True
+        self.observer.schedule(Handler(), self.movie_path, recursive=True)
+        self.observer.start()
+
+    def _scan_folders(self):
+        """
+        获取各文件夹中的文件名
+        """
+        return {root: set(files) for root, dirs, files in os.walk(self.movie_path)}
+
+    def _poll(self):
+        """
+        与上次遍历结果对比, 记录新出现的文件名; 不比较修改时间, 移动或保留时间复制(mv、cp -p、rsync -a)的文件也能发现
+        """
+        folder_files_dic = self._scan_folders()
+        for folder, files in folder_files_dic.items():
+            for name in files - self.folder_files_dic.get(folder, set()):
+                self.add(os.path.join(folder, name))
+        self.folder_files_dic = folder_files_dic
+
+    def _check_pending(self):
+        """
+        文件大小在 watch_stable_time 秒内不再变化时, 视为写入完成
+        """
+        now = time.time()
+        stable_time = config.watch_stable_time
+        movie_path, _, _, escape_folder_list, _, _ = get_movie_path_setting()
+        if "folder" in config.no_escape or config.main_mode == 3 or config.main_mode == 4:
+            escape_folder_list = []
+        with self.lock:
+            for path, info in list(self.pending.items()):
+                try:
+                    size = os.path.getsize(path)
+                except OSError:  # 文件已删除或移走
+                    del self.pending[path]
+                    continue
+                if size != info[0]:
+                    info[0] = size
+                    info[1] = now
+                elif size and now - info[1] >= stable_time:
+                    del self.pending[path]
+                    if is_new_movie_file(path, movie_path, escape_folder_list, config.media_type):
+                        self.ready_list.append(path)
+            ready_list = list(self.ready_list)
+        if ready_list and self.on_ready(ready_list):
+            with self.lock:
+                self.ready_list = [i for i in self.ready_list if i not in ready_list]
+
+    def _run(self):
+        thread = self.thread
+        last_poll_time = time.time()
+        while self.running and self.thread is thread:
+            time.sleep(1)
+            try:
+                if not self.observer and time.time() - last_poll_time >= POLL_INTERVAL:
+                    last_poll_time = time.time()
+                    self._poll()
+                self._check_pending()
+            except Exception:
+                signal.show_traceback_log(traceback.format_exc())
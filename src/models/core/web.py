@@ -13,9 +13,16 @@ from lxml import etree
 
 from models.base.file import copy_file, delete_file, move_file, split_path
 from models.base.image import check_pic, cut_thumb_to_poster
-from models.base.pool import Pool
 from models.base.utils import get_used_time
-from models.base.web import check_url, get_big_pic_by_google, get_html, get_imgsize, multi_download
+from models.base.web import (
+    check_url,
+    download_many,
+    get_big_pic_by_google,
+    get_html,
+    get_imgsize,
+    multi_download,
+    web,
+)
 from models.config.config import config
 from models.core.flags import Flags
 from models.signals import signal
@@ -95,16 +102,6 @@ def download_file_with_filepath(json_data, url, file_path, folder_new_path):
     return False
 
 
-def _mutil_extrafanart_download_thread(task):
-    json_data, extrafanart_url, extrafanart_file_path, extrafanart_folder_path, extrafanart_name = task
-    if download_file_with_filepath(json_data, extrafanart_url, extrafanart_file_path, extrafanart_folder_path):
-        if check_pic(extrafanart_file_path):
-            return True
-    else:
-        json_data["logs"] += f"\n 💡 {extrafanart_name} download failed! ( {extrafanart_url} )"
-        return False
-
-
 def trailer_download(json_data, folder_new_path, folder_old_path, naming_rule):
     start_time = time.time()
     download_files = config.download_files
@@ -822,14 +819,16 @@ def extrafanart_download(json_data, folder_new_path):
             extrafanart_count += 1
             extrafanart_name = "fanart" + str(extrafanart_count) + ".jpg"
             extrafanart_file_path = os.path.join(extrafanart_folder_path_temp, extrafanart_name)
-            task_list.append(
-                [json_data, extrafanart_url, extrafanart_file_path, extrafanart_folder_path_temp, extrafanart_name]
-            )
-        extrafanart_pool = Pool(20)  # 剧照下载线程池
-        result = extrafanart_pool.map(_mutil_extrafanart_download_thread, task_list)
-        for res in result:
-            if res:
+            task_list.append((extrafanart_url, extrafanart_file_path))
+        # 所有剧照在异步引擎中并发下载, 不再为每个文件创建下载线程池
+        result = download_many(task_list)
+        for i, res in enumerate(result):
+            extrafanart_url, extrafanart_file_path = task_list[i]
+            if res and check_pic(extrafanart_file_path):
                 extrafanart_count_succ += 1
+            elif not res:
+                extrafanart_name = os.path.basename(extrafanart_file_path)
+                json_data["logs"] += f"\n 💡 {extrafanart_name} download failed! ( {extrafanart_url} )"
         if extrafanart_count_succ == extrafanart_count:
             if extrafanart_folder_path_temp != extrafanart_folder_path:
                 shutil.rmtree(extrafanart_folder_path)
@@ -886,6 +885,11 @@ def show_netstatus():
             + "    重试次数："
             + str(retry_count)
         )
+    open_hosts = web.breaker.get_open_hosts()
+    if open_hosts:
+        signal.show_net_info(" 暂停请求的网站（连续请求失败）：")
+        for host, wait_time, failures in open_hosts:
+            signal.show_net_info(f"   {host}    剩余：{wait_time:.0f}s    连续失败：{failures} 次")
     signal.show_net_info("=" * 80)
 
 
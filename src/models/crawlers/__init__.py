@@ -0,0 +1,136 @@
+"""
+网站爬虫注册表
+爬虫模块在首次使用时才导入, main() 返回 {网站: {"zh_cn": 数据, "zh_tw": 数据, "jp": 数据}}
+第三方爬虫可调用 register 注册, 或在安装包的 entry points 中声明 mdcx.crawlers 组, 导入时调用 register
+"""
+
+import importlib
+import threading
+import traceback
+from dataclasses import dataclass
+
+ALL_LANGUAGES = ("zh_cn", "zh_tw", "jp")
+
+
+@dataclass
+class CrawlerInfo:
+    name: str
+    module: str = ""  # 模块路径, 首次使用时导入其 main 函数
+    args: tuple = ()  # main(number, appoint_url, log_info, req_web, language) 之后的参数, 可选值见 CRAWLER_ARGS
+    languages: tuple = ("jp",)  # 网站提供的语言, 首个为默认语言
+    url_patterns: tuple = ()  # 网址包含其中任意一项时, 视为此网站的网址
+    func: object = None
+
+    def get_main(self):
+        if self.func is None:
+            self.func = importlib.import_module(self.module).main
+        return self.func
+
+    def get_language(self, language):
+        """
+        网站不提供指定语言时, 使用默认语言
+        """
+        return language if language in self.languages else self.languages[0]
+
+
+# 爬虫可使用的额外参数
+CRAWLER_ARGS = ("mosaic", "org_language", "file_path", "short_number", "appoint_number")
+
+_registry = {}
+_lock = threading.RLock()  # 插件在 _load_plugins 持有锁时导入并调用 register, 须可重入
+_plugins_loaded = False
+
+
+def register(name, module="", args=(), languages=("jp",), url_patterns=(), func=None):
+    """
+    注册爬虫, module 与 func 二选一; 同名时覆盖已有的爬虫
+    """
+    for each in args:
+        if each not in CRAWLER_ARGS:
+            raise ValueError(f"不支持的爬虫参数: {each}")
+    with _lock:
+        _registry[name] = CrawlerInfo(name, module, tuple(args), tuple(languages), tuple(url_patterns), func)
+
+
+def _load_plugins():
+    global _plugins_loaded
+    with _lock:
+        if _plugins_loaded:
+            return
+        _plugins_loaded = True
+        try:
+            from importlib.metadata import entry_points
+
+            eps = entry_points()
+            group = eps.select(group="mdcx.crawlers") if hasattr(eps, "select") else eps.get("mdcx.crawlers", [])
+            for ep in group:
+                try:
+                    ep.load()
+                except Exception:
+                    traceback.print_exc()
+        except Exception:
+            traceback.print_exc()
+
+
+def get_crawler(name):
+    """
+    获取爬虫信息, 不存在时返回 None
+    """
+    if name not in _registry:
+        _load_plugins()
+    return _registry.get(name)
+
+
+def find_crawler_by_url(url):
+    """
+    根据网址查找爬虫名称, 不存在时返回 None
+    """
+    _load_plugins()
+    url = url.lower()
+    for info in list(_registry.values()):
+        for pattern in info.url_patterns:
+            if pattern.lower() in url:
+                return info.name
+
+
+def _builtin(name, module, args=(), languages=("jp",)):
+    register(name, "models.crawlers." + module, args, languages)
+
+
+_builtin("official", "official")
+_builtin("iqqtv", "iqqtv_new", languages=ALL_LANGUAGES)
+_builtin("avsex", "avsex", languages=ALL_LANGUAGES)
+_builtin("airav_cc", "airav_cc", languages=ALL_LANGUAGES)
+_builtin("airav", "airav", languages=ALL_LANGUAGES)
+_builtin("freejavbt", "freejavbt")
+_builtin("javbus", "javbus", ("mosaic",))
+_builtin("javdb", "javdb", ("org_language",))
+_builtin("jav321", "jav321")
+_builtin("dmm", "dmm", ("file_path",))
+_builtin("javlibrary", "javlibrary_new", languages=ALL_LANGUAGES)
+_builtin("xcity", "xcity")
+_builtin("avsox", "avsox")
+_builtin("mgstage", "mgstage", ("short_number",))
+_builtin("7mmtv", "mmtv", ("file_path",))
+_builtin("fc2", "fc2")
+_builtin("fc2hub", "fc2hub")
+_builtin("fc2club", "fc2club")
+_builtin("mdtv", "mdtv", ("file_path", "appoint_number"), ("zh_cn",))
+_builtin("madouqu", "madouqu", ("file_path", "appoint_number"), ALL_LANGUAGES)
+_builtin("hscangku", "hscangku", ("file_path", "appoint_number"))
+_builtin("cableav", "cableav", ("file_path", "appoint_number"))
+_builtin("getchu", "getchu")
+_builtin("getchu_dmm", "getchu_dmm")
+_builtin("mywife", "mywife")
+_builtin("giga", "giga")
+_builtin("hdouban", "hdouban", ("file_path", "appoint_number", "mosaic"))
+_builtin("lulubar", "lulubar", languages=ALL_LANGUAGES)
+_builtin("love6", "love6")
+_builtin("cnmdb", "cnmdb", ("file_path", "appoint_number"))
+_builtin("faleno", "faleno")
+_builtin("fantastica", "fantastica")
+_builtin("theporndb", "theporndb", ("file_path",))
+_builtin("dahlia", "dahlia")
+_builtin("prestige", "prestige")
+_builtin("kin8", "kin8")
+_builtin("javday", "javday")
@@ -284,14 +284,7 @@ def main(number, appoint_url="", log_info="", req_web="", language="zh_cn"):
             "req_web": req_web + f"({round((time.time() - start_time), )}s) ",
         }
     dic = {website_name: {"zh_cn": dic, "zh_tw": dic, "jp": dic}}
-    js = json.dumps(
-        dic,
-        ensure_ascii=False,
-        sort_keys=False,
-        indent=4,
-        separators=(",", ": "),
-    )  # .encode('UTF-8')
-    return js
+    return dic
 
 
 if __name__ == "__main__":
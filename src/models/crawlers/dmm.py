@@ -509,8 +509,7 @@ def main(number, specified_url="", log_info="", req_web="", language="jp", file_
             ),
         }
     dic = {website_name: {"zh_cn": dic, "zh_tw": dic, "jp": dic}}
-    js = json.dumps(dic, ensure_ascii=False, sort_keys=False, indent=4, separators=(",", ": "))  # .encode('UTF-8')
-    return js
+    return dic
 
 
 if __name__ == "__main__":
@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
 
-import json
-
 from models.crawlers import dmm, getchu
 
 
 def main(number, appoint_url="", log_info="", req_web="", language="jp"):
-    json_data_getchu = json.loads(getchu.main(number, appoint_url, log_info, req_web, "jp"))
+    json_data_getchu = getchu.main(number, appoint_url, log_info, req_web, "jp")
     json_data_new = json_data_getchu["getchu"]["jp"]
     log_info = json_data_new["log_info"]
     req_web = json_data_new["req_web"]
@@ -15,8 +13,8 @@ def main(number, appoint_url="", log_info="", req_web="", language="jp"):
     if json_data_new["title"]:
         number = json_data_new["number"]
         if number.startswith("DLID") or "dl.getchu" in appoint_url:
-            return json_data_getchu
-    json_data_dmm = json.loads(dmm.main(number, appoint_url, log_info, req_web, "jp"))
+            return {"getchu_dmm": json_data_getchu["getchu"]}
+    json_data_dmm = dmm.main(number, appoint_url, log_info, req_web, "jp")
     if json_data_dmm["dmm"]["jp"]["title"]:
         json_data_new.update(json_data_dmm["dmm"]["jp"])
         if poster:  # 使用 getchu 封面
@@ -27,19 +25,13 @@ def main(number, appoint_url="", log_info="", req_web="", language="jp"):
     else:
         json_data_new["log_info"] = json_data_dmm["dmm"]["jp"]["log_info"]
         json_data_new["req_web"] = json_data_dmm["dmm"]["jp"]["req_web"]
-    return json.dumps(
-        {
-            "getchu_dmm": {
-                "zh_cn": json_data_new,
-                "zh_tw": json_data_new,
-                "jp": json_data_new,
-            }
-        },
-        ensure_ascii=False,
-        sort_keys=False,
-        indent=4,
-        separators=(",", ": "),
-    )
+    return {
+        "getchu_dmm": {
+            "zh_cn": json_data_new,
+            "zh_tw": json_data_new,
+            "jp": json_data_new,
+        }
+    }
 
 
 if __name__ == "__main__":
@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import json
-
 from models.config.config import config
 from models.crawlers import iqqtv
 
@@ -16,17 +14,11 @@ def main(number, appoint_url="", log_info="", req_web="", language="zh_cn"):
         + config.studio_language
     )
     appoint_url = appoint_url.replace("/cn/", "/jp/").replace("iqqtv.cloud/player", "iqqtv.cloud/jp/player")
-    json_data = json.loads(iqqtv.main(number, appoint_url, log_info, req_web, "jp"))
+    json_data = iqqtv.main(number, appoint_url, log_info, req_web, "jp")
     if not json_data["iqqtv"]["jp"]["title"]:
         json_data["iqqtv"]["zh_cn"] = json_data["iqqtv"]["jp"]
         json_data["iqqtv"]["zh_tw"] = json_data["iqqtv"]["jp"]
-        return json.dumps(
-            json_data,
-            ensure_ascii=False,
-            sort_keys=False,
-            indent=4,
-            separators=(",", ": "),
-        )
+        return json_data
 
     log_info = json_data["iqqtv"]["jp"]["log_info"]
     req_web = json_data["iqqtv"]["jp"]["req_web"]
@@ -39,20 +31,13 @@ def main(number, appoint_url="", log_info="", req_web="", language="zh_cn"):
         language = "zh_tw"
         appoint_url = json_data["iqqtv"]["jp"]["website"].replace("/jp/", "/")
 
-    json_data_zh = json.loads(iqqtv.main(number, appoint_url, log_info, req_web, language))
+    json_data_zh = iqqtv.main(number, appoint_url, log_info, req_web, language)
     dic = json_data_zh["iqqtv"][language]
     dic["originaltitle"] = json_data["iqqtv"]["jp"]["originaltitle"]
     dic["originalplot"] = json_data["iqqtv"]["jp"]["originalplot"]
     json_data["iqqtv"].update({"zh_cn": dic, "zh_tw": dic})
 
-    js = json.dumps(
-        json_data,
-        ensure_ascii=False,
-        sort_keys=False,
-        indent=4,
-        separators=(",", ": "),
-    )  # .encode('UTF-8')
-    return js
+    return json_data
 
 
 if __name__ == "__main__":
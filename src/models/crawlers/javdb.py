@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import json
-import random
 import re
 import time  # yapf: disable # NOQA: E402
 
@@ -14,8 +12,6 @@ from models.config.config import config
 urllib3.disable_warnings()  # yapf: disable
 # import traceback
 
-sleep = True
-
 
 def get_number(html, number):
     result = html.xpath('//a[@class="button is-white copy-to-clipboard"]/@data-clipboard-text')
@@ -198,12 +194,10 @@ def get_wanted(html):
 
 
 def main(number, appoint_url="", log_info="", req_web="", language="jp", org_language="zh_cn"):
-    global sleep
     start_time = time.time()
     website_name = "javdb"
     req_web += "-> %s" % website_name
 
-    javdb_time = config.javdb_time
     header = {"cookie": config.javdb}
     javdb_url = getattr(config, "javdb_website", "https://javdb.com")
     if appoint_url and "?locale" not in appoint_url:
@@ -218,13 +212,7 @@ def main(number, appoint_url="", log_info="", req_web="", language="jp", org_lan
     web_info = "\n       "
     debug_info = ""
 
-    if javdb_time > 0 and sleep:
-        rr = random.randint(int(javdb_time / 2), javdb_time)
-        log_info += "\n    🌐 javdb (⏱ %sS)" % rr
-        for i in range(rr):  # 检查是否手动停止刮削
-            time.sleep(1)
-    else:
-        log_info += "\n    🌐 javdb"
+    log_info += "\n    🌐 javdb"
 
     try:  # 捕获主动抛出的异常
         if not real_url:
@@ -435,18 +423,10 @@ def main(number, appoint_url="", log_info="", req_web="", language="jp", org_lan
             ),
         }
     dic = {website_name: {"zh_cn": dic, "zh_tw": dic, "jp": dic}}
-    js = json.dumps(
-        dic,
-        ensure_ascii=False,
-        sort_keys=False,
-        indent=4,
-        separators=(",", ": "),
-    )  # .encode('UTF-8')
-    return js
+    return dic
 
 
 if __name__ == "__main__":
-    sleep = False
     # yapf: disable
     # print(main('FC2-2792171')) # 开通vip才能查看
     # print(main('080815_130'))   # trailer url is http, not https
@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import json
-
 import urllib3
 
 from models.config.config import config
@@ -20,17 +18,11 @@ def main(number, appoint_url="", log_info="", req_web="", language="zh_cn"):
         + config.studio_language
     )
     appoint_url = appoint_url.replace("/cn/", "/ja/").replace("/tw/", "/ja/")
-    json_data = json.loads(javlibrary.main(number, appoint_url, log_info, req_web, "jp"))
+    json_data = javlibrary.main(number, appoint_url, log_info, req_web, "jp")
     if not json_data["javlibrary"]["jp"]["title"]:
         json_data["javlibrary"]["zh_cn"] = json_data["javlibrary"]["jp"]
         json_data["javlibrary"]["zh_tw"] = json_data["javlibrary"]["jp"]
-        return json.dumps(
-            json_data,
-            ensure_ascii=False,
-            sort_keys=False,
-            indent=4,
-            separators=(",", ": "),
-        )
+        return json_data
 
     log_info = json_data["javlibrary"]["jp"]["log_info"]
     req_web = json_data["javlibrary"]["jp"]["req_web"]
@@ -42,20 +34,13 @@ def main(number, appoint_url="", log_info="", req_web="", language="zh_cn"):
         language = "zh_tw"
         appoint_url = json_data["javlibrary"]["jp"]["website"].replace("/ja/", "/tw/")
 
-    json_data_zh = json.loads(javlibrary.main(number, appoint_url, log_info, req_web, language))
+    json_data_zh = javlibrary.main(number, appoint_url, log_info, req_web, language)
     dic = json_data_zh["javlibrary"][language]
     dic["originaltitle"] = json_data["javlibrary"]["jp"]["originaltitle"]
     dic["originalplot"] = json_data["javlibrary"]["jp"]["originalplot"]
     json_data["javlibrary"].update({"zh_cn": dic, "zh_tw": dic})
 
-    js = json.dumps(
-        json_data,
-        ensure_ascii=False,
-        sort_keys=False,
-        indent=4,
-        separators=(",", ": "),
-    )  # .encode('UTF-8')
-    return js
+    return json_data
 
 
 if __name__ == "__main__":
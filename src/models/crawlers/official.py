@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import json
 import re
 import time  # yapf: disable # NOQA: E402
 
@@ -243,14 +242,7 @@ def main(number, appoint_url="", log_info="", req_web="", language=""):
         "official": {"zh_cn": dic, "zh_tw": dic, "jp": dic},
         website_name: {"zh_cn": dic, "zh_tw": dic, "jp": dic},
     }
-    js = json.dumps(
-        dic,
-        ensure_ascii=False,
-        sort_keys=False,
-        indent=4,
-        separators=(",", ": "),
-    )  # .encode('UTF-8')
-    return js
+    return dic
 
 
 if __name__ == "__main__":
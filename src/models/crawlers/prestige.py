@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import json
 import re
 import time
 
@@ -222,14 +221,7 @@ def main(number, appoint_url="", log_info="", req_web="", language="jp"):
         "official": {"zh_cn": dic, "zh_tw": dic, "jp": dic},
         website_name: {"zh_cn": dic, "zh_tw": dic, "jp": dic},
     }
-    js = json.dumps(
-        dic,
-        ensure_ascii=False,
-        sort_keys=False,
-        indent=4,
-        separators=(",", ": "),
-    )  # .encode('UTF-8')
-    return js
+    return dic
 
 
 if __name__ == "__main__":
@@ -6,15 +6,60 @@
     其他需要操作 UI 的行为
 依赖:
     此模块不应依赖除 models.base.utils 外的任何项目代码
+    未安装 PyQt5 或设置了 MDCX_HEADLESS 时, 使用不依赖 Qt 的信号实现
 """
 
+import os
 import threading
 import time
 
-from PyQt5.QtCore import QObject, pyqtSignal
-
 from models.base.utils import singleton
 
+# 设置环境变量 MDCX_HEADLESS=1 或未安装 PyQt5 时, 使用不依赖 Qt 的信号实现(命令行模式)
+HEADLESS = os.environ.get("MDCX_HEADLESS", "").lower() in ["1", "true", "yes", "on"]
+if not HEADLESS:
+    try:
+        from PyQt5.QtCore import QObject, pyqtSignal
+    except ImportError:
+        HEADLESS = True
+
+if HEADLESS:
+
+    class _BoundSignal:
+        """
+        与 pyqtSignal 绑定后的对象接口一致, 在 emit 的线程中直接调用槽函数
+        """
+
+        def __init__(self):
+            self._slots = []
+
+        def connect(self, slot):
+            self._slots.append(slot)
+
+        def disconnect(self, slot=None):
+            if slot is None:
+                self._slots.clear()
+            elif slot in self._slots:
+                self._slots.remove(slot)
+
+        def emit(self, *args):
+            for slot in list(self._slots):
+                slot(*args)
+
+    class pyqtSignal:  # noqa: N801
+        def __init__(self, *types):
+            self.name = None
+
+        def __set_name__(self, owner, name):
+            self.name = name
+
+        def __get__(self, instance, owner):
+            if instance is None:
+                return self
+            return instance.__dict__.setdefault(self.name, _BoundSignal())
+
+    QObject = object
+
 
 @singleton
 class Signals(QObject):